@@ -80,7 +80,8 @@ class AlertRateLimiter(RateLimiter):
         Returns:
             float: Unix timestamp when limit resets
         """
-        connection_messages = self.websocket_requests[connection_id]
+        # Read without inserting, so probing unknown connections adds no entries
+        connection_messages = self.websocket_requests.get(connection_id)
         if not connection_messages:
             return time.time()
         
@@ -160,7 +161,9 @@ def alert_rest_rate_limit(max_requests: int = 20, window_seconds: int = 60):
             # Check rate limit using alert-specific limiter
             if not alert_rate_limiter.is_allowed(client_ip, max_requests, window_seconds):
                 reset_time = alert_rate_limiter.get_reset_time(client_ip, window_seconds)
-                retry_after = int(reset_time - time.time())
+                retry_after = max(
+                    1, -((time.monotonic_ns() - reset_time) // 1_000_000_000)
+                )
                 
                 # Record rate limit violation
                 record_rate_limit_exceeded('rest', client_ip)
@@ -187,11 +187,15 @@ class AlertWebSocketManager:
         self.redis_client: Optional[redis.Redis] = None
         self.channel_layer: Optional[RedisChannelLayer] = None
         self.heartbeat_task: Optional[asyncio.Task] = None
+        self.publish_task: Optional[asyncio.Task] = None
+        self._publish_q: Optional[asyncio.Queue] = None
         
         # Configuration from environment
         self.redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
         self.heartbeat_interval = int(os.getenv("WEBSOCKET_HEARTBEAT_INTERVAL", "30"))
         self.max_connections_per_user = int(os.getenv("WEBSOCKET_MAX_CONNECTIONS_PER_USER", "5"))
+        self.publish_queue_size = int(os.getenv("WEBSOCKET_PUBLISH_QUEUE_SIZE", "10000"))
+        self.publish_batch_size = 128
         
         # Redis channel names
         self.alert_channel = "alerts:broadcast"
@@ -204,27 +208,34 @@ class AlertWebSocketManager:
             self.redis_client = redis.from_url(self.redis_url)
             await self.redis_client.ping()
             
-            # Initialize Redis channel layer for pub-sub
+            # Channel layer for Channels consumers; alert fan-out publishes
+            # directly on the Redis client (see _publish_drain)
             self.channel_layer = RedisChannelLayer(hosts=[self.redis_url])
             
             # Start heartbeat task
             self.heartbeat_task = asyncio.create_task(self._heartbeat_loop())
             
+            # Start fire-and-forget publisher for cross-instance fan-out
+            self._publish_q = asyncio.Queue(maxsize=self.publish_queue_size)
+            self.publish_task = asyncio.create_task(self._publish_drain())
+            
             logger.info("AlertWebSocketManager initialized with Redis support")
             
         except Exception as e:
             logger.warning(f"Redis connection failed, falling back to in-memory mode: {e}")
             self.redis_client = None
             self.channel_layer = None
+            self._publish_q = None
     
     async def shutdown(self):
         """Clean shutdown of the WebSocket manager."""
-        if self.heartbeat_task:
-            self.heartbeat_task.cancel()
-            try:
-                await self.heartbeat_task
-            except asyncio.CancelledError:
-                pass
+        for task in (self.heartbeat_task, self.publish_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
         
         if self.redis_client:
             await self.redis_client.close()
@@ -303,10 +314,13 @@ class AlertWebSocketManager:
         start_time = datetime.utcnow()
         stats = {"total_sent": 0, "failed": 0, "filtered": 0}
         
+        # Serialize the alert once and reuse it for local and Redis delivery
+        alert_payload = alert.dict()
+        
         # Create WebSocket message
         alert_message = WebSocketMessage(
             type="alert",
-            data=alert.dict()
+            data=alert_payload
         )
         
         # Filter and send to subscribed connections
@@ -322,19 +336,20 @@ class AlertWebSocketManager:
             else:
                 stats["filtered"] += 1
         
-        # Broadcast via Redis for other instances
-        if self.channel_layer:
+        # Broadcast via Redis for other instances (fire-and-forget)
+        if self._publish_q is not None:
+            payload = json.dumps(
+                {
+                    "type": "alert.broadcast",
+                    "alert": alert_payload,
+                    "timestamp": datetime.utcnow().isoformat()
+                },
+                default=str
+            )
             try:
-                await self.channel_layer.send(
-                    self.alert_channel,
-                    {
-                        "type": "alert.broadcast",
-                        "alert": alert.dict(),
-                        "timestamp": datetime.utcnow().isoformat()
-                    }
-                )
-            except Exception as e:
-                logger.error(f"Failed to broadcast alert via Redis: {e}")
+                self._publish_q.put_nowait(payload)
+            except asyncio.QueueFull:
+                logger.error("Redis publish queue full, dropping cross-instance alert broadcast")
         
         # Calculate and log performance
         broadcast_time = (datetime.utcnow() - start_time).total_seconds() * 1000
@@ -426,6 +441,31 @@ class AlertWebSocketManager:
         
         return True
     
+    async def _publish_drain(self) -> None:
+        """Background task that batches queued alert payloads into Redis PUBLISH pipelines."""
+        publish_q = self._publish_q
+        redis_client = self.redis_client
+        if publish_q is None or redis_client is None:
+            return
+        while True:
+            try:
+                batch = [await publish_q.get()]
+                while len(batch) < self.publish_batch_size:
+                    try:
+                        batch.append(publish_q.get_nowait())
+                    except asyncio.QueueEmpty:
+                        break
+                
+                pipe = redis_client.pipeline(transaction=False)
+                for payload in batch:
+                    pipe.publish(self.alert_channel, payload)
+                await pipe.execute()
+                
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Failed to broadcast alerts via Redis: {e}")
+    
     async def _heartbeat_loop(self):
         """Background task to check connection health and clean up stale connections."""
         while True:
@@ -5,54 +5,337 @@ Provides dependency injection functions for JWT validation and user authenticati
 Uses Auth0 JWKS for token validation and integrates with Plone user system.
 """
 
+import asyncio
+import hashlib
 import json
+import logging
 import os
-from functools import lru_cache
-from typing import Optional
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Optional, TypedDict
 
 import httpx
 from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jose import JWTError, jwk, jwt
+from jose.backends import RSAKey
+from jose.backends.base import Key
+from pydantic import EmailStr, TypeAdapter, ValidationError
 
 from .models import User
 from .plone_bridge import sync_auth0_user_to_plone
 
-# Security scheme for FastAPI automatic documentation
+logger = logging.getLogger(__name__)
+
+# RS256 verification should go through the OpenSSL-backed cryptography
+# backend (installed via python-jose[cryptography]); the pure-Python
+# fallback is several times slower per signature check
+if not RSAKey.__module__.endswith("cryptography_backend"):
+    logger.warning(
+        "python-jose is using the %s RSA backend; install "
+        "python-jose[cryptography] for faster JWT verification",
+        RSAKey.__module__,
+    )
+
+# Security schemes for FastAPI automatic documentation
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)  # token may come from cookies
 
 # Auth0 configuration from environment variables
 AUTH0_DOMAIN = os.getenv("AUTH0_DOMAIN", "dev-1fx6yhxxi543ipno.us.auth0.com")
 AUTH0_CLIENT_ID = os.getenv("AUTH0_CLIENT_ID", "s05QngyZXEI3XNdirmJu0CscW1hNgaRD")
 AUTH0_ALGORITHMS = ["RS256"]
 
+# Role and permission sets granting elevated access (compared lowercased)
+_ADMIN_ROLES = frozenset({"manager", "admin", "administrator"})
+_ALERTS_WRITE_PERMS = frozenset(
+    {"alerts:write", "alerts:*", "write:alerts", "*:write", "admin", "all"}
+)
+
+# Values derived from the Auth0 configuration, built once at import
+_ISSUER = f"https://{AUTH0_DOMAIN}/"
+_JWKS_URL = f"https://{AUTH0_DOMAIN}/.well-known/jwks.json"
+_JWT_DECODE_OPTIONS = {
+    "verify_aud": False,  # Skip audience verification for MVP
+    "verify_exp": True,  # Verify token expiration
+    "verify_iat": True,  # Verify issued at time
+    "verify_nbf": True,  # Verify not before time
+    "verify_signature": True,  # Verify token signature
+    "require_exp": True,  # Require expiration claim
+    "require_iat": True,  # Require issued at claim
+    "leeway": 0,  # No clock skew allowance on exp/iat/nbf
+}
+_EMAIL_ADAPTER = TypeAdapter(EmailStr)  # validates the fallback user's email claim
+
+
+# JWKS cache settings: keys are re-fetched after the TTL so Auth0 key rotation
+# is picked up, and unknown key IDs force at most one refresh per interval
+# Default TTL, used when Auth0 does not send Cache-Control: max-age
+JWKS_CACHE_TTL = int(os.getenv("AUTH0_JWKS_CACHE_TTL", "600"))  # 10 minutes
+# Bounds applied to Cache-Control max-age: Auth0 advertises very short values
+# (e.g. max-age=15) although signing keys rotate on a timescale of months, and
+# unknown key IDs already force a refresh, so a short max-age only adds traffic
+JWKS_MIN_CACHE_TTL = int(os.getenv("AUTH0_JWKS_MIN_CACHE_TTL", str(JWKS_CACHE_TTL)))
+JWKS_MAX_CACHE_TTL = 86400  # 24 hours
+JWKS_MIN_REFRESH_INTERVAL = 30  # seconds between forced refreshes
+JWKS_EARLY_REFRESH_RATIO = 0.8  # refresh in the background past 80% of the TTL
+JWKS_STALE_IF_ERROR = 300  # serve expired keys this long if Auth0 is unreachable
+JWKS_REQUIRED_FIELDS = frozenset({"kty", "kid", "use", "n", "e"})
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+
+class _JWKSCache(TypedDict, total=False):
+    """Cached JWKS with its fetch time, ETag and Cache-Control TTL."""
+
+    jwks: dict[str, Any]
+    fetched_at: float
+    etag: Optional[str]
+    ttl: float
+
+
+_jwks_cache: _JWKSCache = {}
+_parsed_keys: dict[str, Key] = {}  # kid -> constructed RSA key for the cached JWKS
+_jwks_lock: Optional[asyncio.Lock] = None
+_jwks_lock_loop: Optional[asyncio.AbstractEventLoop] = None
+_jwks_refresh_task: Optional[asyncio.Task] = None
+
+
+def _new_jwks_http_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        timeout=10.0, limits=httpx.Limits(max_keepalive_connections=10)
+    )
+
+
+# Shared HTTP client so JWKS refreshes reuse pooled TLS connections
+_jwks_http_client = _new_jwks_http_client()
+
+
+def _get_jwks_lock() -> asyncio.Lock:
+    """
+    Return the lock that single-flights JWKS fetches on the running loop.
+
+    asyncio locks bind to the first event loop that waits on them, so a new
+    lock is created whenever the module is used from a different loop (e.g.
+    separate TestClient instances or worker restarts in the same process).
+    """
+    global _jwks_lock, _jwks_lock_loop
+
+    loop = asyncio.get_running_loop()
+    if _jwks_lock is None or _jwks_lock_loop is not loop:
+        _jwks_lock = asyncio.Lock()
+        _jwks_lock_loop = loop
+    return _jwks_lock
+
+
+def _get_jwks_http_client() -> httpx.AsyncClient:
+    """Return the shared JWKS client, reopening it after a lifespan shutdown."""
+    global _jwks_http_client
+
+    if _jwks_http_client.is_closed:
+        _jwks_http_client = _new_jwks_http_client()
+    return _jwks_http_client
+
+
+def _jwks_age() -> float:
+    """Seconds since the cached JWKS was fetched (infinite if never fetched)."""
+    if not _jwks_cache:
+        return float("inf")
+    return time.monotonic() - _jwks_cache["fetched_at"]
+
+
+def _jwks_ttl() -> float:
+    """TTL of the cached JWKS, as advertised by Auth0's Cache-Control header."""
+    return _jwks_cache.get("ttl", JWKS_CACHE_TTL)
+
+
+def _jwks_is_fresh(force_refresh: bool = False) -> bool:
+    """Check whether the cached JWKS can be served without a refetch."""
+    if force_refresh:
+        return _jwks_age() < JWKS_MIN_REFRESH_INTERVAL
+    return _jwks_age() < _jwks_ttl()
 
-@lru_cache
-def get_auth0_public_key():
+
+def _parse_max_age(cache_control: Optional[str]) -> Optional[int]:
+    """
+    Extract max-age seconds from a Cache-Control header, if present.
+
+    The value is clamped to [JWKS_MIN_CACHE_TTL, JWKS_MAX_CACHE_TTL].
+    """
+    if not cache_control:
+        return None
+    match = _MAX_AGE_RE.search(cache_control)
+    if not match:
+        return None
+    return min(max(int(match.group(1)), JWKS_MIN_CACHE_TTL), JWKS_MAX_CACHE_TTL)
+
+
+def _validate_jwks(raw_jwks: dict) -> dict:
+    """
+    Keep only JWKS keys that carry every component needed for RS256 checks.
+
+    Done once per fetch so per-request key lookups need no field checks.
+    Also indexes the RSA key components by kid for O(1) lookups.
+    """
+    valid_keys = []
+    by_kid = {}
+    for key in raw_jwks.get("keys", []):
+        if JWKS_REQUIRED_FIELDS <= key.keys():
+            valid_keys.append(key)
+            by_kid[key["kid"]] = {field: key[field] for field in JWKS_REQUIRED_FIELDS}
+        else:
+            logger.warning(f"Ignoring malformed JWKS key: {key.get('kid', '<no kid>')}")
+    return {"keys": valid_keys, "by_kid": by_kid}
+
+
+async def _refresh_jwks() -> dict:
+    """
+    Fetch, validate and cache the JWKS. Callers must hold the JWKS lock.
+
+    Refreshes are conditional on the cached ETag, so an unchanged key set
+    costs a 304 response and keeps the already-parsed signing keys.
+    """
+    headers = {}
+    etag = _jwks_cache.get("etag")
+    if etag:
+        headers["If-None-Match"] = etag
+
+    response = await _get_jwks_http_client().get(_JWKS_URL, headers=headers)
+    max_age = _parse_max_age(response.headers.get("Cache-Control"))
+
+    if response.status_code == 304 and _jwks_cache:
+        _jwks_cache["fetched_at"] = time.monotonic()
+        if max_age is not None:
+            _jwks_cache["ttl"] = max_age
+        return _jwks_cache["jwks"]
+
+    response.raise_for_status()
+    jwks = _validate_jwks(response.json())
+
+    _jwks_cache["jwks"] = jwks
+    _jwks_cache["fetched_at"] = time.monotonic()
+    _jwks_cache["etag"] = response.headers.get("ETag")
+    _jwks_cache["ttl"] = max_age if max_age is not None else JWKS_CACHE_TTL
+    _parsed_keys.clear()
+    return jwks
+
+
+async def _refresh_jwks_background() -> None:
+    """Refresh the JWKS ahead of expiry so no request waits on the fetch."""
+    async with _get_jwks_lock():
+        if _jwks_age() < _jwks_ttl() * JWKS_EARLY_REFRESH_RATIO:
+            return  # Already refreshed by another caller
+        try:
+            await _refresh_jwks()
+        except Exception as e:
+            logger.warning(f"Background JWKS refresh failed: {e}")
+
+
+def _schedule_early_refresh() -> None:
+    """Start a background refresh once the cached JWKS nears expiry."""
+    global _jwks_refresh_task
+
+    if _jwks_age() < _jwks_ttl() * JWKS_EARLY_REFRESH_RATIO:
+        return
+    if _jwks_refresh_task is None or _jwks_refresh_task.done():
+        _jwks_refresh_task = asyncio.create_task(_refresh_jwks_background())
+
+
+async def get_auth0_public_key(force_refresh: bool = False) -> dict:
     """
     Fetch Auth0 public keys (JWKS) for JWT signature validation.
-    Cached to avoid repeated API calls.
+    Cached for Auth0's Cache-Control max-age (JWKS_CACHE_TTL seconds when
+    absent) to avoid repeated API calls.
+
+    Past JWKS_EARLY_REFRESH_RATIO of the TTL the cached keys are still
+    served while a background task refreshes them (stale-while-revalidate).
+    Concurrent callers on a cold or expired cache share a single fetch:
+    the first one refreshes under the lock and the rest re-check the
+    cache once they acquire it. If Auth0 is unreachable, expired keys keep
+    being served for up to JWKS_STALE_IF_ERROR seconds.
+
+    Args:
+        force_refresh: Re-fetch the JWKS even if the cached copy is still fresh
+            (used when a token references an unknown key ID)
     """
-    try:
-        response = httpx.get(f"https://{AUTH0_DOMAIN}/.well-known/jwks.json")
-        response.raise_for_status()
-        return response.json()
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Unable to fetch Auth0 public keys: {str(e)}",
-        )
+    if _jwks_is_fresh(force_refresh):
+        if not force_refresh:
+            _schedule_early_refresh()
+        return _jwks_cache["jwks"]
 
+    async with _get_jwks_lock():
+        # Another request may have refreshed the keys while we waited
+        if _jwks_is_fresh(force_refresh):
+            return _jwks_cache["jwks"]
+
+        try:
+            return await _refresh_jwks()
+        except Exception as e:
+            if _jwks_age() < _jwks_ttl() + JWKS_STALE_IF_ERROR:
+                logger.warning(f"JWKS refresh failed, serving cached keys: {e}")
+                return _jwks_cache["jwks"]
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Unable to fetch Auth0 public keys: {str(e)}",
+            )
+
+
+# Verified token payloads keyed by token digest, so replayed bearer tokens
+# skip RS256 signature verification until they expire
+TOKEN_CACHE_TTL = 300  # seconds
+TOKEN_CACHE_MAX_SIZE = 4096
+TOKEN_CACHE_EXP_MARGIN = 5  # stop serving cached payloads this close to exp
+MAX_TOKEN_AGE = 24 * 60 * 60  # 24 hours
+
+# LRU order: most recently used entries live at the end
+_token_cache: OrderedDict[bytes, tuple[dict, float]] = OrderedDict()
+
+
+def _token_cache_key(token: str) -> bytes:
+    """Hash a token into a compact cache key (not a security boundary)."""
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
+def _cache_token_payload(cache_key: bytes, payload: dict, now: float) -> None:
+    """Cache a verified payload until the TTL or its expiry, whichever is first."""
+    cached_until = min(
+        now + TOKEN_CACHE_TTL,
+        payload["exp"] - TOKEN_CACHE_EXP_MARGIN,
+        payload["iat"] + MAX_TOKEN_AGE,
+    )
+    if cached_until <= now:
+        return
 
-def validate_jwt_token(token: str) -> dict:
+    # Evict the least recently used entry; expired ones are dropped on lookup
+    while len(_token_cache) >= TOKEN_CACHE_MAX_SIZE:
+        _token_cache.popitem(last=False)
+
+    _token_cache[cache_key] = (payload, cached_until)
+    _token_cache.move_to_end(cache_key)
+
+
+async def close_jwks_client() -> None:
+    """Close the shared JWKS HTTP client (called on application shutdown)."""
+    if _jwks_refresh_task and not _jwks_refresh_task.done():
+        _jwks_refresh_task.cancel()
+    await _jwks_http_client.aclose()
+
+
+async def validate_jwt_token(token: str) -> dict:
     """
     Validate JWT token using Auth0 public keys with enhanced security.
 
+    Verified payloads are cached by token digest (never the raw token) until
+    TOKEN_CACHE_TTL or shortly before the token's exp, so every caller --
+    get_current_user and the /auth callback, refresh and status routes --
+    pays the RS256 verification once per token. Failed validations are not
+    cached here.
+
     Args:
         token: JWT token string
 
     Returns:
-        dict: Decoded token payload
+        dict: Decoded token payload, shared with the cache (do not mutate)
 
     Raises:
         HTTPException: If token is invalid with specific error details
@@ -63,9 +346,20 @@ def validate_jwt_token(token: str) -> dict:
             detail="Token is required",
         )
 
+    # Serve previously verified tokens from cache
+    cache_key = _token_cache_key(token)
+    now = time.time()
+    cached = _token_cache.get(cache_key)
+    if cached:
+        payload, cached_until = cached
+        if now < cached_until:
+            _token_cache.move_to_end(cache_key)
+            return payload
+        _token_cache.pop(cache_key, None)
+
     try:
         # Get Auth0 public keys
-        jwks = get_auth0_public_key()
+        jwks = await get_auth0_public_key()
 
         # Decode token header to get key ID
         try:
@@ -83,48 +377,31 @@ def validate_jwt_token(token: str) -> dict:
                 detail="Token missing key identifier",
             )
 
-        # Find the correct key
-        rsa_key = {}
-        for key in jwks["keys"]:
-            if key["kid"] == token_kid:
-                # Validate required key components
-                required_fields = ["kty", "kid", "use", "n", "e"]
-                if not all(field in key for field in required_fields):
-                    raise HTTPException(
-                        status_code=status.HTTP_401_UNAUTHORIZED,
-                        detail="Invalid key format in JWKS",
-                    )
-
-                rsa_key = {
-                    "kty": key["kty"],
-                    "kid": key["kid"],
-                    "use": key["use"],
-                    "n": key["n"],
-                    "e": key["e"],
-                }
-                break
-
-        if not rsa_key:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Token key not found in JWKS",
-            )
+        # Reuse the parsed key for this kid; parse it once per JWKS fetch
+        signing_key = _parsed_keys.get(token_kid)
+        if signing_key is None:
+            # Find the correct key, refreshing once in case Auth0 rotated its keys
+            rsa_key = jwks["by_kid"].get(token_kid)
+            if not rsa_key:
+                jwks = await get_auth0_public_key(force_refresh=True)
+                rsa_key = jwks["by_kid"].get(token_kid)
+
+            if not rsa_key:
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Token key not found in JWKS",
+                )
+
+            signing_key = jwk.construct(rsa_key, algorithm=AUTH0_ALGORITHMS[0])
+            _parsed_keys[token_kid] = signing_key
 
         # Validate and decode token with strict security options
         payload = jwt.decode(
             token,
-            rsa_key,
+            signing_key,
             algorithms=AUTH0_ALGORITHMS,
-            issuer=f"https://{AUTH0_DOMAIN}/",
-            options={
-                "verify_aud": False,  # Skip audience verification for MVP
-                "verify_exp": True,  # Verify token expiration
-                "verify_iat": True,  # Verify issued at time
-                "verify_nbf": True,  # Verify not before time
-                "verify_signature": True,  # Verify token signature
-                "require_exp": True,  # Require expiration claim
-                "require_iat": True,  # Require issued at claim
-            },
+            issuer=_ISSUER,
+            options=_JWT_DECODE_OPTIONS,
         )
 
         # Additional payload validation
@@ -134,19 +411,15 @@ def validate_jwt_token(token: str) -> dict:
                 detail="Token missing subject claim",
             )
 
-        # Check if token is not too old (additional security)
-        import time
-
-        current_time = int(time.time())
-        token_age = current_time - payload.get("iat", 0)
-        MAX_TOKEN_AGE = 24 * 60 * 60  # 24 hours
-
-        if token_age > MAX_TOKEN_AGE:
+        # Check if token is not too old (additional security); jose has already
+        # verified iat is present and not in the future, so reuse it directly
+        if now - payload["iat"] > MAX_TOKEN_AGE:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Token is too old, please re-authenticate",
             )
 
+        _cache_token_payload(cache_key, payload, now)
         return payload
 
     except HTTPException:
@@ -178,9 +451,7 @@ def validate_jwt_token(token: str) -> dict:
 
 async def get_current_user(
     request: Request,
-    credentials: Optional[HTTPAuthorizationCredentials] = Depends(
-        HTTPBearer(auto_error=False)
-    ),
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security),
 ) -> User:
     """
     FastAPI dependency to get current authenticated user from JWT token with Plone integration.
@@ -211,28 +482,39 @@ async def get_current_user(
         )
 
     # Validate token and extract user info
-    token_payload = validate_jwt_token(token)
+    token_payload = await validate_jwt_token(token)
 
     # Sync with Plone and get combined user context
     try:
         combined_user = await sync_auth0_user_to_plone(token_payload)
     except Exception as e:
-        import logging
-        logger = logging.getLogger(__name__)
         logger.error(f"Plone sync failed: {e}")
         combined_user = None
 
     if not combined_user:
         # If Plone integration fails, fall back to Auth0-only user
-        # This ensures authentication still works even if Plone is down
-        combined_user = User(
+        # This ensures authentication still works even if Plone is down.
+        # The claims come from a just-verified JWT, so skip model validation
+        # except for the two claims whose shape the JWT does not guarantee:
+        # aud may be a list and email may be absent or malformed.
+        try:
+            email = _EMAIL_ADAPTER.validate_python(token_payload.get("email"))
+        except ValidationError:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Token missing a valid email claim",
+            )
+        aud = token_payload.get("aud") or ""
+        if isinstance(aud, list):
+            aud = aud[0] if aud else ""
+        combined_user = User.model_construct(
             sub=token_payload.get("sub", ""),
-            email=token_payload.get("email", ""),
+            email=email,
             email_verified=token_payload.get("email_verified", False),
             name=token_payload.get("name", ""),
             picture=token_payload.get("picture"),
             nickname=token_payload.get("nickname", ""),
-            aud=token_payload.get("aud", ""),
+            aud=aud,
             iss=token_payload.get("iss", ""),
             exp=token_payload.get("exp", 0),
             iat=token_payload.get("iat", 0),
@@ -243,7 +525,7 @@ async def get_current_user(
     return combined_user
 
 
-def get_current_user_dict(
+async def get_current_user_dict(
     credentials: HTTPAuthorizationCredentials = Depends(security),
 ) -> dict:
     """
@@ -257,7 +539,7 @@ def get_current_user_dict(
         )
 
     # Validate token and extract user info
-    token_payload = validate_jwt_token(credentials.credentials)
+    token_payload = await validate_jwt_token(credentials.credentials)
 
     # Extract user information from token
     user_info = {
@@ -293,14 +575,11 @@ async def get_admin_user(current_user: User = Depends(get_current_user)) -> User
         HTTPException: If user is not an admin
     """
     # Check if user has admin roles or email-based admin access
-    email = current_user.email.lower()
-    user_roles = [role.lower() for role in current_user.roles]
+    email = current_user.email_lower
 
     # Check for admin roles or email patterns
     is_admin = (
-        "manager" in user_roles
-        or "admin" in user_roles
-        or "administrator" in user_roles
+        not _ADMIN_ROLES.isdisjoint(current_user.roles_lower)
         or "admin" in email
         or email == "admin@example.com"
     )
@@ -327,23 +606,12 @@ async def get_alerts_write_user(current_user: User = Depends(get_current_user))
         HTTPException: If user lacks alerts:write permission
     """
     # Check user permissions for alerts:write scope
-    user_permissions = [perm.lower() for perm in current_user.permissions]
-    has_alerts_write = (
-        "alerts:write" in user_permissions
-        or "alerts:*" in user_permissions
-        or "write:alerts" in user_permissions
-        or "*:write" in user_permissions
-        or "admin" in user_permissions
-        or "all" in user_permissions
+    has_alerts_write = not _ALERTS_WRITE_PERMS.isdisjoint(
+        current_user.permissions_lower
     )
 
     # Check user roles for admin-level access
-    user_roles = [role.lower() for role in current_user.roles]
-    has_admin_role = (
-        "manager" in user_roles
-        or "admin" in user_roles
-        or "administrator" in user_roles
-    )
+    has_admin_role = not _ADMIN_ROLES.isdisjoint(current_user.roles_lower)
 
     if has_alerts_write or has_admin_role:
         return current_user
@@ -356,7 +624,8 @@ async def get_alerts_write_user(current_user: User = Depends(get_current_user))
 
 # Optional: dependency for when authentication is optional
 async def get_current_user_optional(
-    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
+    request: Request,
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security),
 ) -> Optional[User]:
     """
     FastAPI dependency for optional authentication.
@@ -365,4 +634,4 @@ async def get_current_user_optional(
     if not credentials:
         return None
 
-    return await get_current_user(credentials)
+    return await get_current_user(request, credentials)
@@ -14,8 +14,8 @@ from ..plone_integration import get_plone_client
 
 router = APIRouter(prefix="/api/auth", tags=["Authentication"])
 
-# Demo storage for synced users
-_demo_synced_users = set()
+# Demo storage for synced users (lowercased emails)
+_demo_synced_users: set[str] = set()
 
 
 @router.get("/plone-sync-status")
@@ -32,11 +32,8 @@ async def check_plone_sync_status(
     """
     # For demo purposes, check if we've already synced this user
     # In real implementation, this would check Plone
-    import hashlib
-    user_hash = hashlib.md5(current_user.email.encode()).hexdigest()
-    
     # Check if user has been "synced" (for demo)
-    synced = user_hash in _demo_synced_users
+    synced = current_user.email.lower() in _demo_synced_users
     
     if synced:
         # Return synced user data
@@ -94,9 +91,7 @@ async def sync_current_user_with_plone(
     """
     try:
         # For demo purposes, mark user as synced
-        import hashlib
-        user_hash = hashlib.md5(current_user.email.encode()).hexdigest()
-        _demo_synced_users.add(user_hash)
+        _demo_synced_users.add(current_user.email.lower())
         
         # Return successful sync
         return {
@@ -5,6 +5,7 @@ Pydantic models for user authentication, JWT tokens, and Auth0 integration.
 """
 
 from datetime import datetime
+from functools import cached_property
 from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel, EmailStr, Field
@@ -41,6 +42,21 @@ class User(BaseModel):
         None, description="Additional Auth0 metadata"
     )
 
+    @cached_property
+    def email_lower(self) -> str:
+        """Lowercased email, computed once per user for authorization checks."""
+        return self.email.lower()
+
+    @cached_property
+    def roles_lower(self) -> frozenset[str]:
+        """Lowercased roles, computed once per user for authorization checks."""
+        return frozenset(role.lower() for role in self.roles)
+
+    @cached_property
+    def permissions_lower(self) -> frozenset[str]:
+        """Lowercased permissions, computed once per user for authorization checks."""
+        return frozenset(perm.lower() for perm in self.permissions)
+
     class Config:
         """Pydantic configuration"""
 
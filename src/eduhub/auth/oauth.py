@@ -5,10 +5,16 @@ FastAPI router implementing Auth0 authorization code flow with login, callback,
 logout, and user information endpoints.
 """
 
+import base64
+import hashlib
+import json
+import logging
 import os
+import queue
 import secrets
 import time
-from typing import Optional
+from logging.handlers import QueueHandler, QueueListener
+from typing import Literal, Optional, cast
 from urllib.parse import quote_plus, urlencode
 
 import httpx
@@ -17,7 +23,7 @@ from fastapi.responses import JSONResponse, RedirectResponse
 
 from .dependencies import get_current_user, validate_jwt_token
 from .models import AuthResponse, User
-from .rate_limiting import get_client_ip, rate_limit
+from .rate_limiting import RateLimit, get_client_ip
 
 # Auth0 configuration
 AUTH0_DOMAIN = os.getenv("AUTH0_DOMAIN", "dev-1fx6yhxxi543ipno.us.auth0.com")
@@ -25,13 +31,108 @@ AUTH0_CLIENT_ID = os.getenv("AUTH0_CLIENT_ID", "s05QngyZXEI3XNdirmJu0CscW1hNgaRD
 AUTH0_CLIENT_SECRET = os.getenv("AUTH0_CLIENT_SECRET", "")
 BACKEND_URL = os.getenv("BACKEND_URL", "http://localhost:8000")
 FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:8001")
+_CALLBACK_URI = f"{BACKEND_URL}/auth/callback"
+
+# Cookie flags: secure outside localhost, SameSite=None for cross-domain
+# deployments and lax for local development
+_IS_PRODUCTION = not BACKEND_URL.startswith("http://localhost")
+_COOKIE_SECURE = _IS_PRODUCTION
+_COOKIE_SAMESITE: Literal["lax", "none"] = "none" if _IS_PRODUCTION else "lax"
+
+# Auth0 URLs built once at import; only per-request parameters are encoded later
+_AUTH0_LOGIN_PREFIX = (
+    f"https://{AUTH0_DOMAIN}/authorize?"
+    + urlencode(
+        {
+            "response_type": "code",
+            "client_id": AUTH0_CLIENT_ID,
+            "redirect_uri": _CALLBACK_URI,
+            "scope": "openid profile email",
+        }
+    )
+    + "&state="
+)
+# Logout always returns to the frontend root (configured in Auth0)
+_LOGOUT_URL = f"https://{AUTH0_DOMAIN}/v2/logout?" + urlencode(
+    {"client_id": AUTH0_CLIENT_ID, "returnTo": FRONTEND_URL}
+)
+
+
+def _new_auth0_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        base_url=f"https://{AUTH0_DOMAIN}",
+        timeout=10.0,
+        limits=httpx.Limits(max_keepalive_connections=20, keepalive_expiry=30.0),
+    )
+
+
+# Shared client for Auth0 token exchanges so logins reuse pooled keep-alive
+# connections instead of paying a TCP + TLS handshake per callback.
+_auth0_client = _new_auth0_client()
+
+
+def _get_auth0_client() -> httpx.AsyncClient:
+    """Return the shared Auth0 client, reopening it after a lifespan shutdown."""
+    global _auth0_client
+
+    if _auth0_client.is_closed:
+        _auth0_client = _new_auth0_client()
+    return _auth0_client
+
+
+# Responses that carry tokens must not be stored by browsers or proxies
+_NO_STORE_HEADERS = {"Cache-Control": "no-store"}
+
+# Pre-encoded bodies for the polled status endpoints' most common answers
+_UNAUTHENTICATED_BODY = b'{"authenticated":false,"user":null}'
+_NO_TOKEN_BODY = (
+    b'{"has_token":false,"status":"no_token",'
+    b'"message":"No authentication token found"}'
+)
+
+# Recently rejected tokens keyed by digest, so a client polling /auth/status
+# with a broken cookie does not pay a signature verification on every poll
+BAD_TOKEN_CACHE_TTL = 60  # seconds
+BAD_TOKEN_CACHE_MAX_SIZE = 2048
+_bad_token_cache: dict[bytes, float] = {}  # token digest -> expiry (monotonic)
+
+# Circuit breaker for Auth0 token exchanges: after AUTH0_BREAKER_THRESHOLD
+# consecutive failures (network errors, 429 or 5xx) callbacks fail fast with
+# 503 for the cooldown, or Auth0's Retry-After if longer. Once it elapses a
+# single probe request is let through (half-open) to test recovery.
+AUTH0_BREAKER_THRESHOLD = 5
+AUTH0_BREAKER_COOLDOWN = 30  # seconds
+_auth0_breaker = {
+    "failures": 0,
+    "opened_at": 0.0,
+    "cooldown": AUTH0_BREAKER_COOLDOWN,
+}
+
+# Demo account roles reported by /auth/status (any other email is "user")
+_ROLE_BY_EMAIL = {
+    "admin@example.com": "admin",
+    "dev@example.com": "developer",
+    "student@example.com": "student",
+}
+
+# Audit trail of authentication events, kept apart from the application log.
+# While the app runs, records are handed to a queue and written by a
+# background thread (see start_audit_logging) so requests never block on I/O.
+_audit_logger = logging.getLogger("eduhub.auth.audit")
+_audit_logger.setLevel(logging.INFO)
+_audit_queue: queue.SimpleQueue = queue.SimpleQueue()
+_audit_queue_handler = QueueHandler(_audit_queue)
+_audit_listener: Optional[QueueListener] = None
 
 # Create the auth router
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 
-@router.get("/login")
-@rate_limit(max_requests=5, window_seconds=60)  # 5 login attempts per minute
+@router.get(
+    "/login",
+    # 5 login attempts per minute
+    dependencies=[Depends(RateLimit(max_requests=5, window_seconds=60, precise=True))],
+)
 async def login(
     request: Request,
     return_to: Optional[str] = None,
@@ -50,68 +151,71 @@ async def login(
     Returns:
         RedirectResponse: Redirect to Auth0 Universal Login
     """
-    # Generate state parameter for CSRF protection
-    state = secrets.token_urlsafe(32)
+    # Generate state parameter for CSRF protection; it also carries return_to
+    # so a single cookie covers the whole round trip
+    state = _build_state(return_to)
 
-    # Store state and return_to in session (for now, we'll use a simple approach)
-    # In production, you might want to use Redis or database storage
+    # Build Auth0 authorization URL; the state is URL-safe as generated, so
+    # only the optional prompt/login_hint parameters need encoding
+    auth_url = _AUTH0_LOGIN_PREFIX + state
 
-    # Build Auth0 authorization URL
-    params = {
-        "response_type": "code",
-        "client_id": AUTH0_CLIENT_ID,
-        "redirect_uri": f"{BACKEND_URL}/auth/callback",
-        "scope": "openid profile email",
-        "state": state,
-    }
-
-    # Add prompt parameter if provided (e.g., "login" to force login screen)
-    if prompt:
-        params["prompt"] = prompt
-
-    # Add login_hint to pre-fill email address
+    # login_hint pre-fills the email address and, unless a prompt is given
+    # (e.g. "login" to force the login screen), always requires the password
     if login_hint:
-        params["login_hint"] = login_hint
-        # If login_hint is provided, always force login screen to require password
-        if "prompt" not in params:
-            params["prompt"] = "login"
-
-    auth_url = f"https://{AUTH0_DOMAIN}/authorize?" + urlencode(params)
+        auth_url += "&" + urlencode(
+            {"prompt": prompt or "login", "login_hint": login_hint}
+        )
+    elif prompt:
+        auth_url += "&prompt=" + quote_plus(prompt)
 
     # Return redirect response to Auth0
     response = RedirectResponse(url=auth_url, status_code=status.HTTP_302_FOUND)
 
     # Store state in httpOnly cookie for security
-    is_production = not BACKEND_URL.startswith("http://localhost")
     response.set_cookie(
         key="auth_state",
         value=state,
         httponly=True,
-        secure=is_production,  # Secure in production, not in localhost
-        samesite=(
-            "lax" if not is_production else "none"
-        ),  # none for cross-domain in production
+        secure=_COOKIE_SECURE,
+        samesite=_COOKIE_SAMESITE,
         max_age=600,  # 10 minutes
     )
 
-    # Store return_to URL if provided
-    if return_to:
-        response.set_cookie(
-            key="return_to",
-            value=return_to,
-            httponly=True,
-            secure=is_production,  # Secure in production, not in localhost
-            samesite=(
-                "lax" if not is_production else "none"
-            ),  # none for cross-domain in production
-            max_age=600,
-        )
-
     return response
 
 
-@router.get("/callback")
-@rate_limit(max_requests=10, window_seconds=60)  # 10 callbacks per minute
+def _build_state(return_to: Optional[str]) -> str:
+    """
+    Build the OAuth state: a 128-bit CSRF nonce, plus the base64url-encoded
+    return_to URL when one is given ("<nonce>.<return_to>").
+
+    The state is also stored in the httpOnly auth_state cookie and callback
+    requires an exact match, so the embedded URL cannot be tampered with.
+    """
+    nonce = secrets.token_urlsafe(16)
+    if not return_to:
+        return nonce
+    encoded = base64.urlsafe_b64encode(return_to.encode()).rstrip(b"=").decode()
+    return f"{nonce}.{encoded}"
+
+
+def _return_to_from_state(state: str) -> Optional[str]:
+    """Extract the return_to URL embedded by _build_state, if any."""
+    _, separator, encoded = state.partition(".")
+    if not separator:
+        return None
+    try:
+        padding = "=" * (-len(encoded) % 4)
+        return base64.urlsafe_b64decode(encoded + padding).decode()
+    except ValueError:
+        return None
+
+
+@router.get(
+    "/callback",
+    # 10 callbacks per minute
+    dependencies=[Depends(RateLimit(max_requests=10, window_seconds=60))],
+)
 async def callback(
     request: Request,
     code: Optional[str] = None,
@@ -171,7 +275,7 @@ async def callback(
             )
 
         # Validate and decode the ID token to get user info
-        user_info = validate_jwt_token(id_token)
+        user_info = await validate_jwt_token(id_token)
 
         # Log successful login for audit trail
         log_auth_event(
@@ -185,19 +289,23 @@ async def callback(
             },
         )
 
-        # Get return_to URL from cookie, default to frontend URL
-        return_to = request.cookies.get("return_to", f"{FRONTEND_URL}/")
+        # Get return_to URL from the verified state, default to frontend URL
+        return_to = _return_to_from_state(state) or f"{FRONTEND_URL}/"
 
         # For cross-domain auth, pass token in URL fragment
         # This is a quick fix for the demo
         # Use id_token which contains user info and can be validated
         redirect_url = f"{return_to}#token={id_token}"
 
-        # Create redirect response
-        response = RedirectResponse(url=redirect_url, status_code=status.HTTP_302_FOUND)
-
-        return response
+        # Redirect carrying the token; never let browsers or proxies cache it
+        return RedirectResponse(
+            url=redirect_url,
+            status_code=status.HTTP_302_FOUND,
+            headers=_NO_STORE_HEADERS,
+        )
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -222,8 +330,11 @@ async def get_user_info(current_user: User = Depends(get_current_user)):
     return current_user
 
 
-@router.post("/logout")
-@rate_limit(max_requests=10, window_seconds=60)  # 10 logout attempts per minute
+@router.post(
+    "/logout",
+    # 10 logout attempts per minute
+    dependencies=[Depends(RateLimit(max_requests=10, window_seconds=60))],
+)
 async def logout(request: Request):
     """
     Logout user and clear session.
@@ -249,23 +360,19 @@ async def logout(request: Request):
 
     if current_token:
         try:
-            # Get user info for audit log before invalidating
-            token_payload = validate_jwt_token(current_token)
+            # Audit-only: no authorization decision is made on this payload and
+            # the cookie is about to be deleted, so skip signature verification
+            token_payload = _peek_claims(current_token)
             user_info = {
                 "user_id": token_payload.get("sub"),
                 "email": token_payload.get("email"),
             }
-        except:
-            # Token invalid or expired, continue with logout
+        except ValueError:
+            # Token malformed, continue with logout
             pass
 
-    # Build Auth0 logout URL
-    logout_params = {
-        "client_id": AUTH0_CLIENT_ID,
-        "returnTo": return_to,
-    }
-
-    logout_url = f"https://{AUTH0_DOMAIN}/v2/logout?" + urlencode(logout_params)
+    # Auth0 logout URL is fixed (return_to is always FRONTEND_URL)
+    logout_url = _LOGOUT_URL
 
     # Create response with session cleanup
     response = JSONResponse(
@@ -314,12 +421,13 @@ async def clear_session(request: Request):
 
     if current_token:
         try:
-            token_payload = validate_jwt_token(current_token)
+            token_payload = await validate_jwt_token(current_token)
             user_info = {
                 "user_id": token_payload.get("sub"),
                 "email": token_payload.get("email"),
             }
-        except:
+        except HTTPException:
+            # Token invalid or expired, still clear the session
             pass
 
     # Log session clear event
@@ -358,61 +466,115 @@ async def auth_status(request: Request):
         token = request.cookies.get("access_token") or request.cookies.get("id_token")
 
     if not token:
-        return {"authenticated": False, "user": None}
+        return Response(content=_UNAUTHENTICATED_BODY, media_type="application/json")
+
+    token_key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    if _bad_token_cache.get(token_key, 0.0) > time.monotonic():
+        return Response(content=_UNAUTHENTICATED_BODY, media_type="application/json")
 
     try:
         # Validate token and get user info
         # This works with both access_token and id_token
-        user_info = validate_jwt_token(token)
+        user_info = await validate_jwt_token(token)
         # Determine role based on email
         email = user_info.get("email", "")
-        role = "user"  # default role
+        role = _ROLE_BY_EMAIL.get(email, "user")
 
-        if email == "admin@example.com":
-            role = "admin"
-        elif email == "dev@example.com":
-            role = "developer"
-        elif email == "student@example.com":
-            role = "student"
+        return JSONResponse(
+            {
+                "authenticated": True,
+                "user": {
+                    "sub": user_info.get("sub"),
+                    "email": email,
+                    "name": user_info.get("name"),
+                    "picture": user_info.get("picture"),
+                    "role": role,
+                },
+            }
+        )
+    except HTTPException as e:
+        # Token is invalid or expired (not worth re-checking for a while);
+        # other failures such as an unreachable JWKS endpoint are not cached
+        if e.status_code == status.HTTP_401_UNAUTHORIZED:
+            _remember_bad_token(token_key)
+        return Response(content=_UNAUTHENTICATED_BODY, media_type="application/json")
 
-        return {
-            "authenticated": True,
-            "user": {
-                "sub": user_info.get("sub"),
-                "email": email,
-                "name": user_info.get("name"),
-                "picture": user_info.get("picture"),
-                "role": role,
-            },
-        }
-    except Exception:
-        # Token is invalid or expired
-        return {"authenticated": False, "user": None}
+
+def _remember_bad_token(token_key: bytes) -> None:
+    """Negative-cache a rejected token for BAD_TOKEN_CACHE_TTL seconds."""
+    now = time.monotonic()
+    if len(_bad_token_cache) >= BAD_TOKEN_CACHE_MAX_SIZE:
+        for key in [k for k, expiry in _bad_token_cache.items() if expiry <= now]:
+            del _bad_token_cache[key]
+        if len(_bad_token_cache) >= BAD_TOKEN_CACHE_MAX_SIZE:
+            del _bad_token_cache[next(iter(_bad_token_cache))]  # oldest entry
+    _bad_token_cache[token_key] = now + BAD_TOKEN_CACHE_TTL
+
+
+def _peek_claims(token: str) -> dict:
+    """
+    Decode a JWT payload without verifying it.
+
+    Only for reading display fields such as exp/iat; anything trusted must
+    come from validate_jwt_token.
+    """
+    _, payload_b64, _ = token.split(".", 2)
+    padding = "=" * (-len(payload_b64) % 4)
+    claims = json.loads(base64.urlsafe_b64decode(payload_b64 + padding))
+    if not isinstance(claims, dict):
+        raise ValueError("JWT payload is not a JSON object")
+    return claims
 
 
 def log_auth_event(event_type: str, event_data: dict):
     """
     Log authentication events for audit trail.
 
-    In production, this should write to a proper logging system
-    or audit database. For MVP, we'll use simple console logging.
+    Events go to the "eduhub.auth.audit" logger. In production, attach a
+    handler that forwards it to an audit database or log pipeline.
 
     Args:
         event_type: Type of event (login, logout, token_refresh, etc.)
         event_data: Additional event data
     """
-    import json
-    from datetime import datetime
-
     log_entry = {
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": time.time(),
         "event_type": event_type,
         "data": event_data,
     }
 
-    # Simple console logging for MVP
-    # In production, use proper logging framework and send to audit system
-    print(f"AUTH_AUDIT: {json.dumps(log_entry)}")
+    # In production, route the audit logger to the audit system
+    _audit_logger.info("AUTH_AUDIT: %s", json.dumps(log_entry, default=str))
+
+
+def start_audit_logging() -> None:
+    """Write audit events from a background thread (called on app startup)."""
+    global _audit_listener
+
+    if _audit_listener is not None:
+        return
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(
+        logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    )
+    _audit_listener = QueueListener(_audit_queue, stream_handler)
+    _audit_listener.start()
+    _audit_logger.addHandler(_audit_queue_handler)
+    _audit_logger.propagate = False
+
+
+def stop_audit_logging() -> None:
+    """Flush queued audit events and stop the writer thread (on shutdown)."""
+    global _audit_listener
+
+    if _audit_listener is None:
+        return
+
+    _audit_logger.removeHandler(_audit_queue_handler)
+    _audit_logger.propagate = True
+    _audit_listener.stop()
+    _audit_listener = None
 
 
 async def exchange_code_for_tokens(authorization_code: str) -> dict:
@@ -428,53 +590,111 @@ async def exchange_code_for_tokens(authorization_code: str) -> dict:
     Raises:
         HTTPException: If token exchange fails
     """
-    token_url = f"https://{AUTH0_DOMAIN}/oauth/token"
-
     token_data = {
         "grant_type": "authorization_code",
         "client_id": AUTH0_CLIENT_ID,
         "code": authorization_code,
-        "redirect_uri": f"{BACKEND_URL}/auth/callback",
+        "redirect_uri": _CALLBACK_URI,
     }
 
     # Add client_secret only if it's provided (not needed for SPA)
     if AUTH0_CLIENT_SECRET:
         token_data["client_secret"] = AUTH0_CLIENT_SECRET
 
-    async with httpx.AsyncClient() as client:
+    if not _auth0_breaker_allows():
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Auth0 is temporarily unavailable - please retry shortly",
+            headers={"Retry-After": str(int(_auth0_breaker["cooldown"]))},
+        )
+
+    try:
+        response = await _get_auth0_client().post(
+            "/oauth/token",
+            data=token_data,
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+        )
+    except Exception as e:
+        _record_auth0_result(None)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Network error during token exchange: {str(e)}",
+        )
+
+    _record_auth0_result(response)
+
+    try:
+        response.raise_for_status()
+        return cast(dict, response.json())
+
+    except httpx.HTTPStatusError as e:
+        error_detail = "Unknown error"
         try:
-            response = await client.post(
-                token_url,
-                data=token_data,
-                headers={"Content-Type": "application/x-www-form-urlencoded"},
-                timeout=10.0,
+            error_response = e.response.json()
+            error_detail = error_response.get(
+                "error_description", error_response.get("error", "Unknown error")
             )
-            response.raise_for_status()
-            return response.json()
-
-        except httpx.HTTPStatusError as e:
-            error_detail = "Unknown error"
-            try:
-                error_response = e.response.json()
-                error_detail = error_response.get(
-                    "error_description", error_response.get("error", "Unknown error")
-                )
-            except Exception:
-                pass
+        except Exception:
+            pass
 
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Token exchange failed: {error_detail}",
-            )
-        except Exception as e:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Network error during token exchange: {str(e)}",
-            )
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Token exchange failed: {error_detail}",
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Network error during token exchange: {str(e)}",
+        )
+
+
+def _auth0_breaker_allows() -> bool:
+    """Check whether a token exchange may be sent to Auth0 right now."""
+    if _auth0_breaker["failures"] < AUTH0_BREAKER_THRESHOLD:
+        return True  # Closed
+
+    now = time.monotonic()
+    if now - _auth0_breaker["opened_at"] < _auth0_breaker["cooldown"]:
+        return False  # Open
+
+    # Half-open: this request probes Auth0, others keep failing fast until
+    # its result closes or re-opens the breaker
+    _auth0_breaker["opened_at"] = now
+    return True
 
 
-@router.post("/refresh")
-@rate_limit(max_requests=15, window_seconds=60)  # 15 refresh checks per minute
+def _record_auth0_result(response: Optional[httpx.Response]) -> None:
+    """Update the Auth0 circuit breaker (response is None on network errors)."""
+    failed = (
+        response is None or response.status_code == 429 or response.status_code >= 500
+    )
+    if not failed:
+        _auth0_breaker["failures"] = 0
+        _auth0_breaker["cooldown"] = AUTH0_BREAKER_COOLDOWN
+        return
+
+    _auth0_breaker["failures"] += 1
+    if _auth0_breaker["failures"] >= AUTH0_BREAKER_THRESHOLD:
+        cooldown = AUTH0_BREAKER_COOLDOWN
+        retry_after = (
+            "" if response is None else response.headers.get("Retry-After", "")
+        )
+        if retry_after.isdigit():
+            cooldown = max(cooldown, int(retry_after))
+        _auth0_breaker["opened_at"] = time.monotonic()
+        _auth0_breaker["cooldown"] = cooldown
+
+
+async def close_auth0_client() -> None:
+    """Close the shared Auth0 HTTP client (called on application shutdown)."""
+    await _auth0_client.aclose()
+
+
+@router.post(
+    "/refresh",
+    # 15 refresh checks per minute
+    dependencies=[Depends(RateLimit(max_requests=15, window_seconds=60))],
+)
 async def refresh_token(request: Request):
     """
     Check token expiration and provide refresh guidance.
@@ -489,8 +709,6 @@ async def refresh_token(request: Request):
     Returns:
         dict: Token status and refresh guidance
     """
-    import time
-
     # Try to get token from cookie or header
     token = request.cookies.get("access_token")
     if not token:
@@ -506,7 +724,7 @@ async def refresh_token(request: Request):
 
     try:
         # Validate the current token to get payload
-        payload = validate_jwt_token(token)
+        payload = await validate_jwt_token(token)
 
         current_time = int(time.time())
         exp_time = payload.get("exp", 0)
@@ -574,8 +792,6 @@ async def get_token_status(request: Request):
     Returns:
         dict: Token status information
     """
-    import time
-
     # Try to get token from cookie or header
     token = request.cookies.get("access_token")
     if not token:
@@ -584,57 +800,55 @@ async def get_token_status(request: Request):
             token = auth_header.split(" ")[1]
 
     if not token:
-        return {
-            "has_token": False,
-            "status": "no_token",
-            "message": "No authentication token found",
-        }
-
-    try:
-        # Try to decode without validation first to get basic info
-        from jose import jwt
-
-        unverified_payload = jwt.get_unverified_claims(token)
+        return Response(content=_NO_TOKEN_BODY, media_type="application/json")
 
-        current_time = int(time.time())
-        exp_time = unverified_payload.get("exp", 0)
-        iat_time = unverified_payload.get("iat", 0)
+    current_time = int(time.time())
 
-        time_until_expiry = exp_time - current_time
-        token_age = current_time - iat_time
-
-        # Try full validation
+    try:
+        # Validated payloads are cached, so the common case is a cache hit
+        payload = await validate_jwt_token(token)
+    except HTTPException:
+        # Only decode the unverified claims to describe an invalid token
         try:
-            validate_jwt_token(token)
-
-            if time_until_expiry <= 0:
-                status = "expired"
-            elif time_until_expiry < 300:  # 5 minutes
-                status = "expires_soon"
-            else:
-                status = "valid"
-
-            return {
-                "has_token": True,
-                "status": status,
-                "expires_in": time_until_expiry,
-                "token_age_seconds": token_age,
-                "user_sub": unverified_payload.get("sub"),
-                "user_email": unverified_payload.get("email"),
-            }
+            unverified_payload = _peek_claims(token)
+            time_until_expiry = unverified_payload.get("exp", 0) - current_time
+            token_age = current_time - unverified_payload.get("iat", 0)
+        except (ValueError, TypeError):
+            return JSONResponse(
+                {
+                    "has_token": True,
+                    "status": "malformed",
+                    "message": "Token format is invalid",
+                }
+            )
 
-        except HTTPException:
-            return {
+        return JSONResponse(
+            {
                 "has_token": True,
                 "status": "invalid",
                 "expires_in": time_until_expiry,
                 "token_age_seconds": token_age,
                 "message": "Token validation failed",
             }
+        )
 
-    except Exception:
-        return {
+    time_until_expiry = payload.get("exp", 0) - current_time
+    token_age = current_time - payload.get("iat", 0)
+
+    if time_until_expiry <= 0:
+        status = "expired"
+    elif time_until_expiry < 300:  # 5 minutes
+        status = "expires_soon"
+    else:
+        status = "valid"
+
+    return JSONResponse(
+        {
             "has_token": True,
-            "status": "malformed",
-            "message": "Token format is invalid",
+            "status": status,
+            "expires_in": time_until_expiry,
+            "token_age_seconds": token_age,
+            "user_sub": payload.get("sub"),
+            "user_email": payload.get("email"),
         }
+    )
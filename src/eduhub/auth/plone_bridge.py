@@ -5,8 +5,10 @@ This module handles mapping Auth0 users to Plone users, creating users when need
 and combining Auth0 claims with Plone user roles/groups.
 """
 
+import asyncio
 import logging
 import re
+import time
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
@@ -15,6 +17,60 @@ from .models import User
 
 logger = logging.getLogger(__name__)
 
+# Characters Plone does not accept in usernames (alphanumeric + . _ - only)
+_USERNAME_SANITIZE_RE = re.compile(r"[^a-zA-Z0-9._-]")
+
+# Default Plone role by email domain, and accounts that always get Manager
+_DOMAIN_ROLES = {"example.edu": "Faculty", "student.example.edu": "Student"}
+_ADMIN_EMAILS = frozenset({"admin@example.com", "admin@example.edu"})
+
+# Permissions granted by each Plone role; any other role only grants view
+_ROLE_PERMISSIONS = {
+    "Manager": ("create", "edit", "delete", "view", "admin"),
+    "Faculty": ("create", "edit", "view"),
+    "Student": ("view",),
+}
+_DEFAULT_PERMISSIONS = ("view",)
+
+# Plone user records keyed by Auth0 sub, so authenticated requests skip the
+# Plone lookup for a while after the first one
+PLONE_USER_CACHE_TTL = 60  # seconds
+PLONE_USER_CACHE_MAX_SIZE = 5000
+_plone_user_cache: dict[str, tuple[dict[str, Any], float]] = {}
+
+# In-flight lookups keyed by Auth0 sub, so a burst of first logins for the
+# same user shares one Plone lookup/create instead of racing to create it
+_plone_user_inflight: dict[str, asyncio.Future] = {}
+
+
+def _get_cached_plone_user(sub: str) -> Optional[dict[str, Any]]:
+    """Return the cached Plone user for an Auth0 sub, if still fresh."""
+    cached = _plone_user_cache.get(sub)
+    if cached is None:
+        return None
+    plone_user, expires_at = cached
+    if time.monotonic() >= expires_at:
+        _plone_user_cache.pop(sub, None)
+        return None
+    return plone_user
+
+
+def _cache_plone_user(sub: str, plone_user: dict[str, Any]) -> None:
+    """Cache a Plone user for PLONE_USER_CACHE_TTL seconds."""
+    now = time.monotonic()
+    # Re-insert at the end so insertion order stays expiry order
+    _plone_user_cache.pop(sub, None)
+    if len(_plone_user_cache) >= PLONE_USER_CACHE_MAX_SIZE:
+        # Drop expired entries from the head, then the oldest if still full
+        while _plone_user_cache:
+            oldest = next(iter(_plone_user_cache))
+            if _plone_user_cache[oldest][1] > now:
+                break
+            del _plone_user_cache[oldest]
+        if len(_plone_user_cache) >= PLONE_USER_CACHE_MAX_SIZE:
+            del _plone_user_cache[next(iter(_plone_user_cache))]
+    _plone_user_cache[sub] = (plone_user, now + PLONE_USER_CACHE_TTL)
+
 
 def generate_plone_username(email: str, auth0_sub: str) -> str:
     """
@@ -31,7 +87,7 @@ def generate_plone_username(email: str, auth0_sub: str) -> str:
     username_base = email.split("@")[0]
 
     # Clean username to be Plone-compatible (alphanumeric + . _ -)
-    username_clean = re.sub(r"[^a-zA-Z0-9._-]", "_", username_base)
+    username_clean = _USERNAME_SANITIZE_RE.sub("_", username_base)
 
     # Ensure it starts with a letter
     if not username_clean[0].isalpha():
@@ -76,24 +132,23 @@ def extract_roles_from_auth0(auth0_user: dict[str, Any]) -> list[str]:
 
     # Default role mapping based on email domain
     email = auth0_user.get("email", "")
-    if email.endswith("@example.edu"):
-        roles.append("Faculty")
-    elif email.endswith("@student.example.edu"):
-        roles.append("Student")
+    domain_role = _DOMAIN_ROLES.get(email.rpartition("@")[2])
+    if domain_role:
+        roles.append(domain_role)
 
     # Admin detection
-    if email in ["admin@example.com", "admin@example.edu"]:
+    if email in _ADMIN_EMAILS:
         roles.append("Manager")
 
     # Ensure all users get basic Member role
     if not roles:
         roles.append("Member")
 
-    return list(set(roles))  # Remove duplicates
+    return list(dict.fromkeys(roles))  # Remove duplicates, keep order
 
 
 async def get_or_create_plone_user(
-    auth0_user: dict[str, Any]
+    auth0_user: dict[str, Any],
 ) -> Optional[dict[str, Any]]:
     """
     Get existing Plone user or create new one based on Auth0 user data.
@@ -104,12 +159,41 @@ async def get_or_create_plone_user(
     Returns:
         Plone user data dict, or None if error
     """
-    
+
     email = auth0_user.get("email")
     if not email:
         logger.error("Auth0 user missing email address")
         return None
 
+    sub = auth0_user.get("sub")
+    if not sub:
+        return await _lookup_or_create_plone_user(auth0_user, email, sub)
+
+    cached_user = _get_cached_plone_user(sub)
+    if cached_user is not None:
+        return cached_user
+
+    inflight = _plone_user_inflight.get(sub)
+    if inflight is not None:
+        # Shield so a cancelled waiter does not cancel the shared lookup
+        return await asyncio.shield(inflight)
+
+    future = asyncio.get_running_loop().create_future()
+    _plone_user_inflight[sub] = future
+    try:
+        plone_user = await _lookup_or_create_plone_user(auth0_user, email, sub)
+        future.set_result(plone_user)
+        return plone_user
+    finally:
+        _plone_user_inflight.pop(sub, None)
+        if not future.done():
+            future.set_result(None)  # Leader was cancelled; waiters fall back
+
+
+async def _lookup_or_create_plone_user(
+    auth0_user: dict[str, Any], email: str, sub: Optional[str]
+) -> Optional[dict[str, Any]]:
+    """Find the Plone user by email, creating it if needed (caches the result)."""
     try:
         plone_client = await get_plone_client()
 
@@ -118,6 +202,8 @@ async def get_or_create_plone_user(
 
         if existing_user:
             logger.info(f"Found existing Plone user for email: {email}")
+            if sub:
+                _cache_plone_user(sub, existing_user)
             return existing_user
 
         # User doesn't exist, create new one
@@ -138,16 +224,20 @@ async def get_or_create_plone_user(
         # Extract roles for user creation
         plone_roles = extract_roles_from_auth0(auth0_user)
 
-        # Create user in Plone
+        # Create user in Plone with its roles in the same request, so no
+        # follow-up call is needed to assign them
         new_user = await plone_client.create_user(
             username=username,
             email=email,
             fullname=fullname,
             description=f"User created from Auth0: {auth0_user.get('sub', '')}",
+            roles=plone_roles,
             # Note: No password set - user authenticates via Auth0
         )
 
         logger.info(f"Successfully created Plone user: {username}")
+        if sub and new_user:
+            _cache_plone_user(sub, new_user)
         return new_user
 
     except PloneAPIError as e:
@@ -194,19 +284,18 @@ def combine_user_context(
         if plone_fullname and len(plone_fullname) > len(name):
             name = plone_fullname
 
-    # Combine and deduplicate roles
-    combined_roles = list(set(auth0_roles + plone_roles))
+    # Combine and deduplicate roles, keeping a stable order
+    combined_roles = list(dict.fromkeys(auth0_roles + plone_roles))
 
-    # Create permissions list from roles
-    permissions = []
-    if "Manager" in combined_roles:
-        permissions.extend(["create", "edit", "delete", "view", "admin"])
-    elif "Faculty" in combined_roles:
-        permissions.extend(["create", "edit", "view"])
-    elif "Student" in combined_roles:
-        permissions.extend(["view"])
-    else:
-        permissions.append("view")  # Default permission
+    # Create permissions list from roles (the role grants are nested, so the
+    # union equals the grant of the most privileged role)
+    permissions = list(
+        dict.fromkeys(
+            permission
+            for role in combined_roles
+            for permission in _ROLE_PERMISSIONS.get(role, _DEFAULT_PERMISSIONS)
+        )
+    ) or list(_DEFAULT_PERMISSIONS)
 
     return User(
         sub=sub,
@@ -222,7 +311,7 @@ def combine_user_context(
         iat=auth0_claims.get("iat", 0),
         # Combined data fields
         roles=combined_roles,
-        permissions=list(set(permissions)),  # Remove duplicates
+        permissions=permissions,
         plone_user_id=plone_user_id,
         plone_groups=plone_groups,
         # Add metadata about the integration
@@ -0,0 +1,568 @@
+// Global variables
+let selectedFile = null;
+let uploadInProgress = false;
+
+// Elements used repeatedly, looked up once; the script loads after the markup
+const consoleEl = document.getElementById('console');
+const authStatusEl = document.getElementById('authStatus');
+const authStatusTextEl = document.getElementById('authStatusText');
+const userInfoEl = document.getElementById('userInfo');
+const systemStatusTextEl = document.getElementById('systemStatusText');
+const fileInfoEl = document.getElementById('fileInfo');
+const previewBtn = document.getElementById('previewBtn');
+const importBtn = document.getElementById('importBtn');
+
+// Initialize on page load
+document.addEventListener('DOMContentLoaded', function() {
+    logConsole('🎓 EduHub OAuth2 Test Console Initialized');
+    logConsole('🔧 Auth0 Domain: ' + auth0_domain);
+    logConsole('🆔 Client ID: ' + auth0_client_id);
+    logConsole('🌐 Base URL: ' + window.location.origin);
+    logConsole('');
+    logConsole('📋 Instructions:');
+    logConsole('1. Click "🚀 Start Login Flow" to begin');
+    logConsole('2. Use test credentials when prompted');
+    logConsole('3. Watch the workflow steps above');
+    logConsole('4. Test user info and logout when ready');
+    logConsole('5. Test CSV Schedule Importer functionality');
+    logConsole('');
+
+    checkAuthStatus();
+    setupFileUpload();
+    checkSystemStatus();
+});
+
+// Lines logged since the last frame, appended together in one layout
+let pendingConsoleLines = [];
+let consoleRenderScheduled = false;
+
+// Console logging function
+function logConsole(message) {
+    const timestamp = new Date().toLocaleTimeString();
+    const line = `[${timestamp}] ${message}`;
+    pendingConsoleLines.push(line);
+    if (!consoleRenderScheduled) {
+        consoleRenderScheduled = true;
+        requestAnimationFrame(renderPendingLines);
+    }
+
+    // Store in localStorage for persistence
+    persistLog(line);
+}
+
+function renderPendingLines() {
+    consoleRenderScheduled = false;
+    consoleEl.appendChild(document.createTextNode(pendingConsoleLines.join('\n') + '\n'));
+    pendingConsoleLines = [];
+    consoleEl.scrollTop = consoleEl.scrollHeight;
+}
+
+// Persisted log history, written to localStorage in batches
+const MAX_PERSISTED_LOGS = 100;
+const PERSIST_DELAY_MS = 1000;
+let persistedLogs = null;
+let persistTimer = null;
+
+function readPersistedLogs() {
+    try {
+        return JSON.parse(localStorage.getItem('consoleLogs') || '[]');
+    } catch (err) {
+        return [];
+    }
+}
+
+function persistLog(line) {
+    // Parse the stored history once, then only append in memory
+    if (persistedLogs === null) {
+        persistedLogs = readPersistedLogs();
+    }
+    persistedLogs.push(line);
+    // Trim in amortised batches so a burst between flushes stays bounded
+    if (persistedLogs.length >= 2 * MAX_PERSISTED_LOGS) {
+        persistedLogs = persistedLogs.slice(-MAX_PERSISTED_LOGS);
+    }
+    if (persistTimer === null) {
+        persistTimer = setTimeout(flushPersistedLogs, PERSIST_DELAY_MS);
+    }
+}
+
+function flushPersistedLogs() {
+    clearTimeout(persistTimer);
+    persistTimer = null;
+    if (persistedLogs === null) {
+        return;
+    }
+    persistedLogs = persistedLogs.slice(-MAX_PERSISTED_LOGS); // Keep last 100 logs
+    try {
+        localStorage.setItem('consoleLogs', JSON.stringify(persistedLogs));
+    } catch (err) {
+        // Storage full or disabled; the on-screen console still has everything
+    }
+}
+
+// Write any pending lines before navigating away (login/logout redirects)
+window.addEventListener('pagehide', flushPersistedLogs);
+
+// Load persisted logs
+function loadPersistedLogs() {
+    const logs = persistedLogs !== null ? persistedLogs : readPersistedLogs();
+    consoleEl.textContent = logs.join('\n') + '\n';
+    consoleEl.scrollTop = consoleEl.scrollHeight;
+}
+
+// Show lines of untrusted text (user or server data) separated by <br>
+function setTextLines(element, lines) {
+    const nodes = [];
+    lines.forEach((line, i) => {
+        if (i > 0) {
+            nodes.push(document.createElement('br'));
+        }
+        nodes.push(document.createTextNode(line));
+    });
+    element.replaceChildren(...nodes);
+}
+
+// Copy console content to clipboard
+function copyConsole() {
+    navigator.clipboard.writeText(consoleEl.textContent).then(() => {
+        logConsole('📋 Console output copied to clipboard');
+    }).catch(err => {
+        logConsole('❌ Failed to copy console output: ' + err.message);
+    });
+}
+
+// Copy text to clipboard
+function copyToClipboard(text) {
+    navigator.clipboard.writeText(text).then(() => {
+        logConsole('📋 Copied: ' + text);
+    }).catch(err => {
+        logConsole('❌ Failed to copy: ' + err.message);
+    });
+}
+
+// Small JSON API calls; keepalive lets them finish across the login/logout redirects
+function apiFetch(path, options = {}) {
+    return fetch(path, {credentials: 'include', keepalive: true, ...options});
+}
+
+// Navigate once the frame showing the latest log lines has painted
+function navigateAfterPaint(url) {
+    requestAnimationFrame(() => requestAnimationFrame(() => {
+        window.location.href = url;
+    }));
+}
+
+// OAuth2 Flow Functions
+async function testLogin() {
+    logConsole('🚀 Starting OAuth2 login flow...');
+    logConsole('📋 Remember to use test credentials:');
+    logConsole('📧 dev@example.com / 🔑 DevPassword123!');
+    logConsole('📧 admin@example.com / 🔑 AdminPassword123!');
+
+    document.getElementById('step1').classList.add('active');
+
+    const return_to = encodeURIComponent(window.location.href);
+    const loginUrl = `/auth/login?return_to=${return_to}`;
+
+    logConsole('🌐 Redirecting to Auth0...');
+    navigateAfterPaint(loginUrl);
+}
+
+async function testUserInfo() {
+    logConsole('👤 Testing user info endpoint...');
+    try {
+        const response = await apiFetch('/auth/user');
+
+        if (response.ok) {
+            const userData = await response.json();
+            logConsole('✅ User info retrieved successfully:');
+            logConsole('📧 Email: ' + userData.email);
+            logConsole('🆔 ID: ' + userData.sub);
+            logConsole('👤 Name: ' + userData.name);
+            logConsole('🏠 Plone ID: ' + (userData.plone_user_id || 'Not synced'));
+
+            document.getElementById('step3').classList.add('completed');
+            return userData;
+        } else {
+            logConsole('❌ Failed to get user info: ' + response.status);
+            return null;
+        }
+    } catch (error) {
+        logConsole('❌ Error getting user info: ' + error.message);
+        return null;
+    }
+}
+
+async function logout() {
+    logConsole('🚪 Logging out...');
+    try {
+        const response = await apiFetch('/auth/logout', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json'
+            },
+            body: JSON.stringify({
+                return_to: window.location.href // This return_to is now ignored by server
+            })
+        });
+
+        if (response.ok) {
+            const result = await response.json(); // Parse JSON response
+            logConsole('✅ Logout successful');
+
+            // Clear any remaining cookies on client side
+            document.cookie = 'access_token=; expires=Thu, 01 Jan 1970 00:00:00 UTC; path=/;';
+            document.cookie = 'id_token=; expires=Thu, 01 Jan 1970 00:00:00 UTC; path=/;';
+
+            // Update UI immediately
+            authStatusEl.className = 'auth-status not-authenticated';
+            authStatusTextEl.textContent = '❌ Not authenticated';
+            userInfoEl.textContent = '';
+            previewBtn.disabled = true;
+            importBtn.disabled = true;
+
+            logConsole('🔄 Session cleared locally');
+
+            // Redirect to Auth0 logout (clears Auth0 session)
+            if (result.redirect_url) {
+                logConsole('🌐 Redirecting to complete logout...');
+                navigateAfterPaint(result.redirect_url);
+            }
+        } else {
+            logConsole('❌ Logout failed');
+        }
+    } catch (error) {
+        logConsole('❌ Logout error: ' + error.message);
+
+        // Force clear cookies even if request failed
+        document.cookie = 'access_token=; expires=Thu, 01 Jan 1970 00:00:00 UTC; path=/;';
+        document.cookie = 'id_token=; expires=Thu, 01 Jan 1970 00:00:00 UTC; path=/;';
+
+        // Update UI
+        authStatusEl.className = 'auth-status not-authenticated';
+        authStatusTextEl.textContent = '❌ Not authenticated';
+        userInfoEl.textContent = '';
+        previewBtn.disabled = true;
+        importBtn.disabled = true;
+
+        logConsole('🔄 Session cleared locally (fallback)');
+    }
+}
+
+function testLogout() {
+    logout();
+}
+
+async function checkAuthStatus() {
+    logConsole('🔍 Checking authentication status...');
+    try {
+        const response = await apiFetch('/auth/user');
+
+        if (response.ok) {
+            const userData = await response.json();
+            authStatusEl.className = 'auth-status authenticated';
+            authStatusTextEl.textContent = '✅ Authenticated';
+            setTextLines(userInfoEl, ['👤 ' + userData.email, '🆔 ' + userData.sub]);
+
+            logConsole('✅ Authenticated as: ' + userData.email);
+            logConsole('🆔 User ID: ' + userData.sub);
+
+            // Enable CSV importer buttons if file is selected
+            if (selectedFile) {
+                previewBtn.disabled = false;
+                importBtn.disabled = false;
+            }
+        } else {
+            authStatusEl.className = 'auth-status not-authenticated';
+            authStatusTextEl.textContent = '❌ Not authenticated';
+            userInfoEl.textContent = '';
+
+            // Disable CSV importer buttons
+            previewBtn.disabled = true;
+            importBtn.disabled = true;
+        }
+    } catch (error) {
+        logConsole('❌ Error checking auth status: ' + error.message);
+        authStatusEl.className = 'auth-status not-authenticated';
+        authStatusTextEl.textContent = '❌ Error checking status';
+    }
+}
+
+function openSwagger() {
+    logConsole('📖 Opening Swagger documentation...');
+    window.open('/docs', '_blank');
+}
+
+async function checkSystemStatus() {
+    logConsole('⚙️ Checking CSV importer system status...');
+    try {
+        const response = await apiFetch('/import/schedule/status');
+        if (response.ok) {
+            const status = await response.json();
+            systemStatusTextEl.textContent = '✅ ' + status.status;
+            setTextLines(document.getElementById('systemCapabilities'), [
+                '📁 Formats: ' + status.supported_formats.join(', '),
+                '📏 Max size: ' + status.max_file_size_mb + 'MB'
+            ]);
+            logConsole('✅ CSV importer system operational');
+        } else {
+            logConsole('❌ System status check failed');
+            systemStatusTextEl.textContent = '❌ System check failed';
+        }
+    } catch (error) {
+        logConsole('❌ Error checking system status: ' + error.message);
+        systemStatusTextEl.textContent = '❌ Error checking system';
+    }
+}
+
+function setupFileUpload() {
+    const fileUpload = document.getElementById('fileUpload');
+    const fileInput = document.getElementById('fileInput');
+
+    // Click to select file
+    fileUpload.addEventListener('click', () => {
+        fileInput.click();
+    });
+
+    // Handle file selection
+    fileInput.addEventListener('change', handleFileSelect);
+
+    // Drag and drop handlers
+    fileUpload.addEventListener('dragover', (e) => {
+        e.preventDefault();
+        fileUpload.classList.add('dragover');
+    });
+
+    fileUpload.addEventListener('dragleave', () => {
+        fileUpload.classList.remove('dragover');
+    });
+
+    fileUpload.addEventListener('drop', (e) => {
+        e.preventDefault();
+        fileUpload.classList.remove('dragover');
+
+        const files = e.dataTransfer.files;
+        if (files.length > 0) {
+            fileInput.files = files;
+            handleFileSelect({target: fileInput});
+        }
+    });
+}
+
+function handleFileSelect(event) {
+    const file = event.target.files[0];
+    if (file) {
+        selectedFile = file;
+        fileInfoEl.textContent = `📄 ${file.name} (${(file.size / 1024).toFixed(1)} KB)`;
+
+        logConsole('📁 File selected: ' + file.name);
+        logConsole('📏 Size: ' + (file.size / 1024).toFixed(1) + ' KB');
+
+        // Enable preview/import buttons if authenticated
+        checkAuthStatus();
+    }
+}
+
+function downloadTemplate() {
+    logConsole('📋 Downloading CSV template...');
+    window.location.href = '/import/schedule/template';
+    logConsole('✅ Template download started');
+}
+
+async function testPreview() {
+    if (!selectedFile) {
+        logConsole('❌ No file selected for preview');
+        return;
+    }
+
+    logConsole('👀 Testing preview mode with: ' + selectedFile.name);
+    await uploadFile(true); // preview_only = true
+}
+
+async function testImport() {
+    if (!selectedFile) {
+        logConsole('❌ No file selected for import');
+        return;
+    }
+
+    logConsole('⚡ Testing import mode with: ' + selectedFile.name);
+
+    // Don't upload a file for import that is certain to fail validation
+    const errors = await preValidate(selectedFile);
+    if (errors && errors.length > 0) {
+        logConsole(`❌ Import skipped: ${errors.length} validation error(s) found locally`);
+        for (const error of errors.slice(0, 5)) {
+            logConsole(`  Row ${error.row_number}: ${error.message}`);
+        }
+        logConsole('💡 Use Preview to see the server\'s full validation report');
+        return;
+    }
+
+    await uploadFile(false); // preview_only = false
+}
+
+// Schedule rules mirrored from the importer (schedule_importer parser and models)
+const REQUIRED_COLUMNS = ['program', 'date', 'time', 'instructor', 'room'];
+const DATE_PATTERN = /^\d{4}-\d{2}-\d{2}$/;
+const TIME_PATTERN = /^\d{2}:\d{2}$/;
+const MAX_UPLOAD_BYTES = 10 * 1024 * 1024;
+
+// Check a CSV for errors the server would certainly report, without uploading it.
+// Returns null for files this simple reader can't judge (Excel, quoted fields).
+async function preValidate(file) {
+    if (!file.name.toLowerCase().endsWith('.csv')) {
+        return null;
+    }
+    const text = await file.text();
+    if (text.includes('"')) {
+        return null;
+    }
+
+    const lines = text.split(/\r?\n/);
+    const columns = {};
+    lines[0].split(',').forEach((name, i) => {
+        columns[name.trim().toLowerCase()] = i;
+    });
+    const missing = REQUIRED_COLUMNS.filter(name => !(name in columns));
+    if (missing.length > 0) {
+        return [{row_number: 1, message: 'Missing required columns: ' + missing.join(', ')}];
+    }
+
+    const errors = [];
+    let rowNumber = 1;
+    for (let i = 1; i < lines.length; i++) {
+        if (lines[i].trim() === '') {
+            continue; // Blank lines are skipped by the server too
+        }
+        rowNumber++;
+        const cells = lines[i].split(',');
+        const value = name => (name in columns ? (cells[columns[name]] || '').trim() : '');
+
+        for (const name of REQUIRED_COLUMNS) {
+            if (value(name) === '') {
+                errors.push({row_number: rowNumber, message: `Required field '${name}' is empty`});
+            }
+        }
+        const date = value('date');
+        if (date !== '' && !DATE_PATTERN.test(date)) {
+            errors.push({row_number: rowNumber, message: 'Date must be in YYYY-MM-DD format'});
+        }
+        const time = value('time');
+        if (time !== '' && !TIME_PATTERN.test(time)) {
+            errors.push({row_number: rowNumber, message: 'Time must be in HH:MM format'});
+        }
+        // Non-numeric durations fall back to the default on the server
+        const duration = Math.trunc(Number(value('duration')));
+        if (value('duration') !== '' && Number.isFinite(duration) && (duration < 15 || duration > 480)) {
+            errors.push({row_number: rowNumber, message: 'Duration must be between 15 and 480 minutes'});
+        }
+    }
+    return errors;
+}
+
+async function uploadFile(previewOnly) {
+    // The server rejects larger files, so don't spend the bandwidth sending them
+    if (selectedFile.size > MAX_UPLOAD_BYTES) {
+        logConsole(`❌ File too large: ${(selectedFile.size / 1048576).toFixed(1)} MB (maximum is 10 MB)`);
+        return;
+    }
+
+    // Repeated clicks while a file is still uploading would import it twice
+    if (uploadInProgress) {
+        logConsole('⏳ An upload is already in progress');
+        return;
+    }
+    uploadInProgress = true;
+
+    const formData = new FormData();
+    formData.append('file', selectedFile);
+    formData.append('preview_only', previewOnly);
+
+    try {
+        logConsole(`🔄 Uploading file for ${previewOnly ? 'preview' : 'import'}...`);
+
+        let reportedPercent = 0;
+        const response = await postWithProgress('/import/schedule', formData, (loaded, total) => {
+            const percent = Math.floor(loaded * 4 / total) * 25;
+            if (percent > reportedPercent) {
+                reportedPercent = percent;
+                logConsole(`⏳ Uploaded ${percent}% (${(loaded / 1024).toFixed(0)} of ${(total / 1024).toFixed(0)} KB)`);
+            }
+        });
+
+        if (response.ok) {
+            const result = await response.json();
+            logConsole(`✅ ${previewOnly ? 'Preview' : 'Import'} successful!`);
+            logConsole('📊 Total rows: ' + result.total_rows);
+            logConsole('✅ Valid rows: ' + result.valid_rows);
+            logConsole('⚠️ Validation errors: ' + result.validation_errors.length);
+            logConsole('⚡ Conflicts: ' + result.conflicts.length);
+            logConsole('⏱️ Processing time: ' + result.processing_time_ms + 'ms');
+
+            if (result.created_uids && result.created_uids.length > 0) {
+                logConsole('🆔 Created UIDs: ' + result.created_uids.slice(0, 3).join(', ') +
+                         (result.created_uids.length > 3 ? '...' : ''));
+            }
+
+            if (result.validation_errors.length > 0) {
+                logConsole('📝 Validation errors found:');
+                result.validation_errors.slice(0, 5).forEach(error => {
+                    logConsole(`  Row ${error.row_number}: ${error.message}`);
+                });
+            }
+        } else {
+            const error = await response.json();
+            logConsole(`❌ ${previewOnly ? 'Preview' : 'Import'} failed: ` + error.detail);
+        }
+    } catch (error) {
+        logConsole(`❌ Upload error: ` + error.message);
+    } finally {
+        uploadInProgress = false;
+    }
+}
+
+// POST a form and report upload progress, which fetch() can't do for form bodies
+function postWithProgress(url, formData, onProgress) {
+    return new Promise((resolve, reject) => {
+        const xhr = new XMLHttpRequest();
+        xhr.open('POST', url);
+        xhr.withCredentials = true;
+        xhr.upload.onprogress = event => {
+            if (event.lengthComputable) {
+                onProgress(event.loaded, event.total);
+            }
+        };
+        xhr.onload = () => resolve(new Response(xhr.response, {status: xhr.status}));
+        xhr.onerror = () => reject(new Error('Network error'));
+        xhr.send(formData);
+    });
+}
+
+async function testValidation() {
+    logConsole('🧪 Testing validation with invalid data...');
+
+    // Create a CSV with invalid data for testing
+    const invalidCsv = `program,date,time,instructor,room,duration,description
+Python 101,2025-02-01,09:00,Dr. Smith,Room A,90,Valid entry
+,2025-02-01,14:30,Prof. Johnson,Room B,60,Missing program name
+Math Workshop,invalid-date,14:30,Prof. Johnson,Room B,60,Invalid date format
+Science Lab,2025-02-02,25:00,Dr. Williams,Lab 1,120,Invalid time format
+History Seminar,2025-02-02,16:00,,Room C,75,Missing instructor
+Art Class,2025-02-03,11:00,Ms. Davis,,90,Missing room
+Physics Lecture,2025-02-03,13:00,Dr. Anderson,Auditorium,999,Duration too long`;
+
+    const blob = new Blob([invalidCsv], {type: 'text/csv'});
+    const file = new File([blob], 'test_validation.csv', {type: 'text/csv'});
+
+    selectedFile = file;
+    fileInfoEl.textContent = '🧪 test_validation.csv (validation test)';
+
+    logConsole('📁 Generated test file with validation errors');
+    await uploadFile(true); // Test preview with invalid data
+}
+
+// Load persisted logs on page load
+loadPersistedLogs();
+
+// Check auth status periodically
+setInterval(checkAuthStatus, 30000); // Every 30 seconds
@@ -53,6 +53,12 @@ async def lifespan(app: FastAPI):
         await dispatch_service.initialize()
         logger.info("✅ Alert dispatch service initialized")
 
+        # Write auth audit events from a background thread
+        from .auth.oauth import start_audit_logging
+
+        start_audit_logging()
+        logger.info("✅ Auth audit logging started")
+
         # Other startup tasks could go here
 
     except Exception as e:
@@ -77,6 +83,36 @@ async def lifespan(app: FastAPI):
         await dispatch_service.shutdown()
         logger.info("✅ Alert dispatch service cleaned up")
 
+        # Close the shared Auth0 JWKS HTTP client
+        from .auth.dependencies import close_jwks_client
+
+        await close_jwks_client()
+        logger.info("✅ Auth0 JWKS client closed")
+
+        # Close the shared Auth0 token exchange client
+        from .auth.oauth import close_auth0_client
+
+        await close_auth0_client()
+        logger.info("✅ Auth0 token client closed")
+
+        # Close the shared Plone client and its connection pool
+        from .plone_integration import close_plone_client
+
+        await close_plone_client()
+        logger.info("✅ Plone client closed")
+
+        # Close the rate limiter's Redis connection, if any
+        from .auth.rate_limiting import close_rate_limiter
+
+        await close_rate_limiter()
+        logger.info("✅ Rate limiter closed")
+
+        # Flush pending auth audit events
+        from .auth.oauth import stop_audit_logging
+
+        stop_audit_logging()
+        logger.info("✅ Auth audit logging stopped")
+
         # Other cleanup tasks could go here
 
     except Exception as e:
@@ -13,7 +13,7 @@ from fastapi.responses import JSONResponse
 from pydantic import HttpUrl, ValidationError
 
 from ..auth.dependencies import get_current_user
-from ..auth.rate_limiting import rate_limit
+from ..auth.rate_limiting import RateLimit
 from .cache import get_oembed_cache
 from .client import get_oembed_client
 from .models import EmbedError, EmbedRequest, EmbedResponse
@@ -97,10 +97,9 @@ Authorization: Bearer YOUR_JWT_TOKEN
 
 **🛡️ Security:** All HTML is sanitized and URLs are validated against an approved provider allow-list.
 """,
+    # Task 5.4.2: 20 requests per minute per IP
+    dependencies=[Depends(RateLimit(max_requests=20, window_seconds=60))],
 )
-@rate_limit(
-    max_requests=20, window_seconds=60
-)  # Task 5.4.2: 20 requests per minute per IP
 async def embed_url(
     request: Request,
     url: str = Query(
@@ -300,8 +299,9 @@ async def embed_url(
     response_model=dict[str, Any],
     summary="List supported providers",
     description="Get list of supported oEmbed providers and their configurations",
+    # More generous for info endpoint
+    dependencies=[Depends(RateLimit(max_requests=30, window_seconds=60))],
 )
-@rate_limit(max_requests=30, window_seconds=60)  # More generous for info endpoint
 async def list_providers(request: Request) -> dict[str, Any]:
     """
     List all supported oEmbed providers.
@@ -7,7 +7,7 @@ while maintaining good performance for legitimate users.
 
 import logging
 import os
-from datetime import datetime
+import time
 from typing import Any, Dict
 
 from fastapi import HTTPException, Request
@@ -99,7 +99,7 @@ async def check_rate_limit(request: Request) -> None:
 
             # Calculate retry-after header
             reset_time = rate_limiter.get_reset_time(client_ip, RATE_LIMIT_WINDOW)
-            retry_after = max(1, int(reset_time - datetime.utcnow().timestamp()))
+            retry_after = max(1, -((time.monotonic_ns() - reset_time) // 1_000_000_000))
 
             raise HTTPException(
                 status_code=429,
@@ -158,9 +158,7 @@ def get_rate_limit_info(request: Request) -> dict[str, Any]:
         client_ip = get_client_ip(request)
         rate_limiter = get_rate_limiter()
 
-        # Get current usage (approximate - check requests history)
-        ip_requests = rate_limiter.requests.get(client_ip, [])
-        current_count = len(ip_requests)
+        current_count = rate_limiter.get_request_count(client_ip, RATE_LIMIT_WINDOW)
 
         return {
             "limit": OPEN_DATA_RATE_LIMIT,
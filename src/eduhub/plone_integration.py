@@ -92,8 +92,15 @@ class PloneClient:
         if self._client is None:
             logger.info(f"Connecting to Plone at {self.config.base_url}")
 
+            # One pooled client per PloneClient; get_plone_client() shares a
+            # single instance so requests reuse warm keep-alive connections
             self._client = httpx.AsyncClient(
                 timeout=httpx.Timeout(self.config.timeout),
+                limits=httpx.Limits(
+                    max_keepalive_connections=50,
+                    max_connections=200,
+                    keepalive_expiry=60.0,
+                ),
                 follow_redirects=True,
                 headers={
                     "Accept": "application/json",
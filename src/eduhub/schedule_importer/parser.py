@@ -21,6 +21,7 @@ class ScheduleParser:
     REQUIRED_COLUMNS = ["program", "date", "time", "instructor", "room"]
     OPTIONAL_COLUMNS = ["duration", "description"]
     MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
+    UPLOAD_CHUNK_SIZE = 1024 * 1024  # Copy spooled uploads 1MB at a time
 
     def __init__(self):
         self.validation_errors: list[ValidationError] = []
@@ -38,10 +39,7 @@ class ScheduleParser:
 
         # Validate file size
         if file.size and file.size > self.MAX_FILE_SIZE:
-            raise HTTPException(
-                status_code=413,
-                detail=f"File too large. Maximum size is {self.MAX_FILE_SIZE // (1024*1024)}MB",
-            )
+            raise self._file_too_large()
 
         # Validate file type
         if not self._is_supported_file(file.filename):
@@ -55,8 +53,16 @@ class ScheduleParser:
             delete=False, suffix=self._get_file_suffix(file.filename)
         ) as tmp_file:
             try:
-                content = await file.read()
-                tmp_file.write(content)
+                # Starlette has already spooled the upload; copy it across in
+                # chunks rather than as one bytes object, and re-check the size
+                # for uploads that didn't declare it. This doesn't limit how
+                # much of the request body the server receives.
+                bytes_written = 0
+                while chunk := await file.read(self.UPLOAD_CHUNK_SIZE):
+                    bytes_written += len(chunk)
+                    if bytes_written > self.MAX_FILE_SIZE:
+                        raise self._file_too_large()
+                    tmp_file.write(chunk)
                 tmp_file.flush()
 
                 # Parse with pandas
@@ -72,6 +78,13 @@ class ScheduleParser:
                 # Clean up temporary file
                 os.unlink(tmp_file.name)
 
+    def _file_too_large(self) -> HTTPException:
+        """Build the error for uploads over the size limit."""
+        return HTTPException(
+            status_code=413,
+            detail=f"File too large. Maximum size is {self.MAX_FILE_SIZE // (1024*1024)}MB",
+        )
+
     def _is_supported_file(self, filename: Optional[str]) -> bool:
         """Check if file type is supported."""
         if not filename:
@@ -187,7 +187,9 @@ class TestAlertRateLimiting:
 
             # Mock reset time (1 second from now)
             with patch.object(
-                alert_rate_limiter, "get_reset_time", return_value=time.time() + 1
+                alert_rate_limiter,
+                "get_reset_time",
+                return_value=time.monotonic_ns() + 1_000_000_000,
             ):
                 response = client.get(
                     "/alerts/test", headers={"Authorization": "Bearer fake-token"}
@@ -244,3 +246,11 @@ class TestAlertRateLimiting:
                 200,
                 500,
             ]  # 500 if service mock fails, but not 429
+
+    @pytest.mark.asyncio
+    async def test_websocket_retry_after_does_not_track_unknown_connection(self):
+        """Looking up the reset time must not create rate limit state."""
+        from src.eduhub.alerts.rate_limit import get_websocket_retry_after
+
+        assert await get_websocket_retry_after("unknown-connection") == 0
+        assert "unknown-connection" not in alert_rate_limiter.websocket_requests
@@ -376,6 +376,35 @@ class TestAlertWebSocketManager:
         assert len(user1_websocket.sent_messages) == 1
         assert len(user2_websocket.sent_messages) == 0
     
+    @pytest.mark.asyncio
+    async def test_broadcast_alert_publishes_without_awaiting_redis(self):
+        """Test that Redis fan-out is queued and drained in pipelined batches."""
+        pipe = MagicMock()
+        pipe.execute = AsyncMock(return_value=[1, 1])
+        self.manager.redis_client = MagicMock()
+        self.manager.redis_client.pipeline.return_value = pipe
+        self.manager._publish_q = asyncio.Queue()
+        
+        for title in ("First", "Second"):
+            alert = Alert(title=title, message="msg", category=AlertCategory.SYSTEM, source="test")
+            await self.manager.broadcast_alert(alert)
+        
+        # Nothing has hit Redis yet; payloads are only queued
+        assert self.manager._publish_q.qsize() == 2
+        pipe.execute.assert_not_called()
+        
+        drain_task = asyncio.create_task(self.manager._publish_drain())
+        await asyncio.sleep(0)
+        drain_task.cancel()
+        await drain_task
+        
+        self.manager.redis_client.pipeline.assert_called_once_with(transaction=False)
+        assert pipe.publish.call_count == 2
+        channel, payload = pipe.publish.call_args_list[0].args
+        assert channel == "alerts:broadcast"
+        assert json.loads(payload)["alert"]["title"] == "First"
+        pipe.execute.assert_awaited_once()
+    
     def test_get_metrics(self):
         """Test metrics collection."""
         # Add some test data
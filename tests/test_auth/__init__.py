@@ -0,0 +1,5 @@
+"""
+Test suite for Auth0 authentication and Plone user bridging.
+
+Covers JWT validation, JWKS caching, and the FastAPI auth dependencies.
+"""
@@ -0,0 +1,179 @@
+"""
+Tests for the OAuth2 + CSV importer testing console page.
+"""
+
+import hashlib
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.eduhub.auth import test_console
+
+IDENTITY = {"Accept-Encoding": "identity"}
+IDENTITY_ETAG = test_console._CONSOLE_VARIANTS[None][1]["ETag"]
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(test_console.router)
+    return TestClient(app)
+
+
+class TestAuthConsole:
+    def test_serves_prerendered_page(self, client):
+        response = client.get("/test/auth-console")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "text/html; charset=utf-8"
+        assert response.content == test_console._CONSOLE_HTML
+        assert "EduHub Testing Console" in response.text
+
+    def test_sends_etag_and_revalidation_headers(self, client):
+        response = client.get("/test/auth-console", headers=IDENTITY)
+
+        assert response.headers["etag"] == IDENTITY_ETAG
+        assert IDENTITY_ETAG == f'"{hashlib.md5(response.content).hexdigest()}"'
+        assert response.headers["cache-control"] == "private, must-revalidate"
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert "content-encoding" not in response.headers
+
+    def test_matching_etag_returns_304(self, client):
+        response = client.get(
+            "/test/auth-console",
+            headers={**IDENTITY, "If-None-Match": IDENTITY_ETAG},
+        )
+
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == IDENTITY_ETAG
+
+    def test_weak_etag_in_list_returns_304(self, client):
+        response = client.get(
+            "/test/auth-console",
+            headers={
+                **IDENTITY,
+                "If-None-Match": f'"other", W/{IDENTITY_ETAG}',
+            },
+        )
+
+        assert response.status_code == 304
+
+    def test_stale_etag_returns_full_page(self, client):
+        response = client.get(
+            "/test/auth-console", headers={"If-None-Match": '"stale"'}
+        )
+
+        assert response.status_code == 200
+        assert response.content == test_console._CONSOLE_HTML
+
+    def test_serves_precompressed_gzip(self, client):
+        response = client.get("/test/auth-console", headers={"Accept-Encoding": "gzip"})
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["etag"] != IDENTITY_ETAG
+        assert response.content == test_console._CONSOLE_HTML
+
+    def test_gzip_etag_does_not_match_identity(self, client):
+        gzip_etag = test_console._CONSOLE_VARIANTS["gzip"][1]["ETag"]
+
+        cached = client.get(
+            "/test/auth-console",
+            headers={"Accept-Encoding": "gzip", "If-None-Match": gzip_etag},
+        )
+        other = client.get(
+            "/test/auth-console", headers={**IDENTITY, "If-None-Match": gzip_etag}
+        )
+
+        assert cached.status_code == 304
+        assert other.status_code == 200
+
+    @pytest.mark.parametrize(
+        "accept_encoding, expected",
+        [
+            ("gzip, deflate", "gzip"),
+            ("gzip;q=0.5", "gzip"),
+            ("*", "gzip"),
+            ("gzip;q=0", None),
+            ("deflate", None),
+            ("", None),
+        ],
+    )
+    def test_negotiate_encoding(self, accept_encoding, expected, monkeypatch):
+        monkeypatch.setattr(test_console, "_ENCODINGS", ("gzip",))
+
+        assert test_console._negotiate_encoding(accept_encoding) == expected
+
+    def test_negotiate_encoding_honours_refusal_over_wildcard(self, monkeypatch):
+        monkeypatch.setattr(test_console, "_ENCODINGS", ("br", "gzip"))
+
+        assert test_console._negotiate_encoding("br;q=0, *") == "gzip"
+        assert test_console._negotiate_encoding("br;q=0, gzip;q=0, *") is None
+
+    def test_minify_drops_indentation_and_comments(self):
+        html = """
+            <div>
+                <!-- Section -->
+                <p>Hi</p>
+
+            </div>
+            <script>
+                // Say hello
+                log('http://example.com');
+                const csv = `a,b
+1,2`;
+            </script>
+        """
+
+        assert test_console._minify(html) == (
+            "<div>\n<p>Hi</p>\n</div>\n<script>\n"
+            "log('http://example.com');\nconst csv = `a,b\n1,2`;\n</script>"
+        )
+
+    def test_build_console_html_fills_placeholders(self):
+        html = test_console._build_console_html(
+            "tenant.example", "client-1", "/app.css", "/app.js"
+        )
+
+        assert "{{" not in html
+        assert "const auth0_domain = 'tenant.example';" in html
+        assert "const auth0_client_id = 'client-1';" in html
+        assert '<link rel="stylesheet" href="/app.css">' in html
+        assert '<script src="/app.js"></script>' in html
+
+    def test_page_uses_origin_relative_urls(self):
+        assert b"localhost" not in test_console._CONSOLE_HTML
+
+    def test_page_does_not_assign_inner_html(self):
+        assert b"innerHTML" not in test_console._SCRIPT_VARIANTS[None][0]
+
+
+class TestConsoleAssets:
+    @pytest.mark.parametrize(
+        "name, content_type",
+        [
+            ("_STYLESHEET_NAME", "text/css; charset=utf-8"),
+            ("_SCRIPT_NAME", "text/javascript; charset=utf-8"),
+        ],
+    )
+    def test_serves_hashed_asset_immutably(self, client, name, content_type):
+        url = f"/test/static/{getattr(test_console, name)}"
+
+        response = client.get(url)
+
+        assert url.encode() in test_console._CONSOLE_HTML
+        assert response.status_code == 200
+        assert response.headers["content-type"] == content_type
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["cache-control"] == test_console.ASSET_CACHE_CONTROL
+
+    def test_asset_name_tracks_content(self):
+        body = test_console._SCRIPT_VARIANTS[None][0]
+
+        assert hashlib.md5(body).hexdigest()[:12] in test_console._SCRIPT_NAME
+
+    def test_stale_asset_name_is_not_found(self, client):
+        response = client.get("/test/static/auth-console.000000000000.css")
+
+        assert response.status_code == 404
@@ -0,0 +1,533 @@
+"""
+Tests for JWT validation and JWKS caching in auth dependencies.
+
+Tokens are signed with a locally generated RSA key and the Auth0 JWKS
+endpoint is mocked, so no network access is required.
+"""
+
+import asyncio
+import base64
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import HTTPException
+from jose import jwt
+
+from src.eduhub.auth import dependencies
+from src.eduhub.auth.models import User
+
+TEST_KID = "test-key-1"
+
+
+def _b64url_uint(value: int) -> str:
+    raw = value.to_bytes((value.bit_length() + 7) // 8, "big")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+@pytest.fixture(scope="module")
+def rsa_keypair():
+    """Generate an RSA key pair and matching JWKS document."""
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_pem = private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+    numbers = private_key.public_key().public_numbers()
+    jwks = {
+        "keys": [
+            {
+                "kty": "RSA",
+                "kid": TEST_KID,
+                "use": "sig",
+                "alg": "RS256",
+                "n": _b64url_uint(numbers.n),
+                "e": _b64url_uint(numbers.e),
+            }
+        ]
+    }
+    return private_pem, jwks
+
+
+def make_token(private_pem: str, kid: str = TEST_KID, **claims) -> str:
+    now = int(time.time())
+    payload = {
+        "sub": "auth0|test-user",
+        "email": "dev@example.com",
+        "iss": f"https://{dependencies.AUTH0_DOMAIN}/",
+        "aud": dependencies.AUTH0_CLIENT_ID,
+        "iat": now,
+        "exp": now + 3600,
+    }
+    payload.update(claims)
+    return jwt.encode(payload, private_pem, algorithm="RS256", headers={"kid": kid})
+
+
+def jwks_response(jwks: dict, status_code: int = 200, headers=None) -> MagicMock:
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    response.json.return_value = jwks
+    response.raise_for_status.return_value = None
+    return response
+
+
+@pytest.fixture(autouse=True)
+def clear_jwks_cache():
+    """Reset module-level JWKS cache between tests."""
+    dependencies._jwks_cache.clear()
+    dependencies._token_cache.clear()
+    dependencies._parsed_keys.clear()
+    yield
+    dependencies._jwks_cache.clear()
+    dependencies._token_cache.clear()
+
+
+class TestJWKSCache:
+    """Test JWKS fetching and caching behavior."""
+
+    async def test_valid_token_is_decoded(self, rsa_keypair):
+        private_pem, jwks = rsa_keypair
+        with patch.object(
+            dependencies._jwks_http_client,
+            "get",
+            new=AsyncMock(return_value=jwks_response(jwks)),
+        ):
+            payload = await dependencies.validate_jwt_token(make_token(private_pem))
+
+        assert payload["sub"] == "auth0|test-user"
+
+    async def test_jwks_fetched_once_while_fresh(self, rsa_keypair):
+        private_pem, jwks = rsa_keypair
+        with patch.object(
+            dependencies._jwks_http_client,
+            "get",
+            new=AsyncMock(return_value=jwks_response(jwks)),
+        ) as mock_get:
+            await dependencies.validate_jwt_token(make_token(private_pem))
+            await dependencies.validate_jwt_token(
+                make_token(private_pem, sub="auth0|other")
+            )
+
+        assert mock_get.call_count == 1
+
+    async def test_signing_key_parsed_once_per_fetch(self, rsa_keypair):
+        private_pem, jwks = rsa_keypair
+        tokens = [make_token(private_pem, sub=f"auth0|user-{i}") for i in range(3)]
+        with patch.object(
+            dependencies._jwks_http_client,
+            "get",
+            new=AsyncMock(return_value=jwks_response(jwks)),
+        ):
+            with patch.object(
+                dependencies.jwk, "construct", wraps=dependencies.jwk.construct
+            ) as mock_construct:
+                for token in tokens:
+                    await dependencies.validate_jwt_token(token)
+
+        assert mock_construct.call_count == 1
+        assert TEST_KID in dependencies._parsed_keys
+
+    async def test_jwks_refetched_after_ttl(self, rsa_keypair):
+        private_pem, jwks = rsa_keypair
+        with patch.object(
+            dependencies._jwks_http_client,
+            "get",
+            new=AsyncMock(return_value=jwks_response(jwks)),
+        ) as mock_get:
+            await dependencies.validate_jwt_token(make_token(private_pem))
+            dependencies._jwks_cache["fetched_at"] -= dependencies.JWKS_CACHE_TTL + 1
+            await dependencies.validate_jwt_token(
+                make_token(private_pem, sub="auth0|other")
+            )
+
+        assert mock_get.call_count == 2
+
+    async def test_unknown_kid_forces_single_refresh(self, rsa_keypair):
+        private_pem, jwks = rsa_keypair
+        stale_jwks = {"keys": [dict(jwks["keys"][0], kid="rotated-out")]}
+        with patch.object(
+            dependencies._jwks_http_client,
+            "get",
+            new_callable=AsyncMock,
+            side_effect=[jwks_response(stale_jwks), jwks_response(jwks)],
+        ) as mock_get:
+            await dependencies.get_auth0_public_key()
+            dependencies._jwks_cache["fetched_at"] -= (
+                dependencies.JWKS_MIN_REFRESH_INTERVAL + 1
+            )
+            payload = await dependencies.validate_jwt_token(make_token(private_pem))
+
+        assert payload["sub"] == "auth0|test-user"
+        assert mock_get.call_count == 2
+
+    async def test_unknown_kid_rejected(self, rsa_keypair):
+        private_pem, jwks = rsa_keypair
+        with patch.object(
+            dependencies._jwks_http_client,
+            "get",
+            new=AsyncMock(return_value=jwks_response(jwks)),
+        ):
+            with pytest.raises(HTTPException) as exc_info:
+                await dependencies.validate_jwt_token(
+                    make_token(private_pem, kid="unknown")
+                )
+
+        assert exc_info.value.status_code == 401
+        assert exc_info.value.detail == "Token key not found in JWKS"
+
+    async def test_early_refresh_serves_cached_keys(self, rsa_keypair):
+        _, jwks = rsa_keypair
+        with patch.object(
+            dependencies._jwks_http_client,
+            "get",
+            new=AsyncMock(return_value=jwks_response(jwks)),
+        ) as mock_get:
+            first = await dependencies.get_auth0_public_key()
+            dependencies._jwks_cache["fetched_at"] -= (
+                dependencies.JWKS_CACHE_TTL * dependencies.JWKS_EARLY_REFRESH_RATIO
+            )
+            second = await dependencies.get_auth0_public_key()
+
+            # Cached keys are returned immediately; the refresh runs afterwards
+            assert second is first
+            assert mock_get.call_count == 1
+            await dependencies._jwks_refresh_task
+
+        assert mock_get.call_count == 2
+        assert dependencies._jwks_age() < 1
+
+    async def test_expired_keys_served_when_auth0_unreachable(self, rsa_keypair):
+        _, jwks = rsa_keypair
+        with patch.object(
+            dependencies._jwks_http_client,
+            "get",
+            new=AsyncMock(
+                side_effect=[jwks_response(jwks), RuntimeError("Auth0 down")]
+            ),
+        ):
+            first = await dependencies.get_auth0_public_key()
+            dependencies._jwks_cache["fetched_at"] -= dependencies.JWKS_CACHE_TTL + 1
+            second = await dependencies.get_auth0_public_key()
+
+        assert second is first
+
+    async def test_cache_control_max_age_sets_ttl(self, rsa_keypair):
+        _, jwks = rsa_keypair
+        max_age = dependencies.JWKS_MIN_CACHE_TTL + 60
+        headers = {"Cache-Control": f"public, max-age={max_age}"}
+        with patch.object(
+            dependencies._jwks_http_client,
+            "get",
+            new=AsyncMock(return_value=jwks_response(jwks, headers=headers)),
+        ):
+            await dependencies.get_auth0_public_key()
+
+        assert dependencies._jwks_ttl() == max_age
+
+    @pytest.mark.parametrize(
+        "max_age, expected",
+        [
+            (15, dependencies.JWKS_MIN_CACHE_TTL),
+            (10**9, dependencies.JWKS_MAX_CACHE_TTL),
+        ],
+    )
+    async def test_cache_control_max_age_is_clamped(
+        self, rsa_keypair, max_age, expected
+    ):
+        _, jwks = rsa_keypair
+        headers = {"Cache-Control": f"public, max-age={max_age}"}
+        with patch.object(
+            dependencies._jwks_http_client,
+            "get",
+            new=AsyncMock(return_value=jwks_response(jwks, headers=headers)),
+        ):
+            await dependencies.get_auth0_public_key()
+
+        assert dependencies._jwks_ttl() == expected
+
+    async def test_refresh_is_conditional_on_etag(self, rsa_keypair):
+        private_pem, jwks = rsa_keypair
+        with patch.object(
+            dependencies._jwks_http_client,
+            "get",
+            new=AsyncMock(
+                side_effect=[
+                    jwks_response(jwks, headers={"ETag": '"v1"'}),
+                    jwks_response({}, status_code=304),
+                ]
+            ),
+        ) as mock_get:
+            await dependencies.validate_jwt_token(make_token(private_pem))
+            parsed_key = dependencies._parsed_keys[TEST_KID]
+            dependencies._jwks_cache["fetched_at"] -= dependencies.JWKS_CACHE_TTL + 1
+            await dependencies.validate_jwt_token(
+                make_token(private_pem, sub="auth0|other")
+            )
+
+        assert mock_get.call_args.kwargs["headers"] == {"If-None-Match": '"v1"'}
+        assert dependencies._jwks_age() < 1
+        # Unchanged key set keeps the already-parsed signing key
+        assert dependencies._parsed_keys[TEST_KID] is parsed_key
+
+    async def test_malformed_keys_dropped_on_fetch(self, rsa_keypair):
+        _, jwks = rsa_keypair
+        malformed = {"kty": "RSA", "kid": "broken", "use": "sig"}
+        with patch.object(
+            dependencies._jwks_http_client,
+            "get",
+            new=AsyncMock(
+                return_value=jwks_response({"keys": [malformed, *jwks["keys"]]})
+            ),
+        ):
+            cached = await dependencies.get_auth0_public_key()
+
+        assert [key["kid"] for key in cached["keys"]] == [TEST_KID]
+
+    async def test_concurrent_cold_cache_shares_one_fetch(self, rsa_keypair):
+        private_pem, jwks = rsa_keypair
+
+        async def slow_get(*args, **kwargs):
+            await asyncio.sleep(0.01)
+            return jwks_response(jwks)
+
+        with patch.object(
+            dependencies._jwks_http_client, "get", new=AsyncMock(side_effect=slow_get)
+        ) as mock_get:
+            tokens = [make_token(private_pem, sub=f"auth0|user-{i}") for i in range(5)]
+            payloads = await asyncio.gather(
+                *(dependencies.validate_jwt_token(token) for token in tokens)
+            )
+
+        assert [p["sub"] for p in payloads] == [f"auth0|user-{i}" for i in range(5)]
+        assert mock_get.call_count == 1
+
+    async def test_concurrent_unknown_kid_shares_one_refresh(self, rsa_keypair):
+        private_pem, jwks = rsa_keypair
+        stale_jwks = {"keys": [dict(jwks["keys"][0], kid="rotated-out")]}
+        responses = iter([jwks_response(stale_jwks), jwks_response(jwks)])
+
+        async def slow_get(*args, **kwargs):
+            await asyncio.sleep(0.01)
+            return next(responses)
+
+        with patch.object(
+            dependencies._jwks_http_client, "get", new=AsyncMock(side_effect=slow_get)
+        ) as mock_get:
+            await dependencies.get_auth0_public_key()
+            dependencies._jwks_cache["fetched_at"] -= (
+                dependencies.JWKS_MIN_REFRESH_INTERVAL + 1
+            )
+            tokens = [make_token(private_pem, sub=f"auth0|user-{i}") for i in range(5)]
+            payloads = await asyncio.gather(
+                *(dependencies.validate_jwt_token(token) for token in tokens)
+            )
+
+        assert [p["sub"] for p in payloads] == [f"auth0|user-{i}" for i in range(5)]
+        assert mock_get.call_count == 2
+
+
+class TestTokenPayloadCache:
+    """Test caching of verified token payloads."""
+
+    async def test_repeated_token_skips_verification(self, rsa_keypair):
+        private_pem, jwks = rsa_keypair
+        token = make_token(private_pem)
+        with patch.object(
+            dependencies._jwks_http_client,
+            "get",
+            new=AsyncMock(return_value=jwks_response(jwks)),
+        ):
+            first = await dependencies.validate_jwt_token(token)
+            with patch.object(dependencies.jwt, "decode") as mock_decode:
+                second = await dependencies.validate_jwt_token(token)
+
+        mock_decode.assert_not_called()
+        assert second == first
+
+    async def test_cache_entry_capped_by_token_expiry(self, rsa_keypair):
+        private_pem, jwks = rsa_keypair
+        token = make_token(private_pem, exp=int(time.time()) + 60)
+        with patch.object(
+            dependencies._jwks_http_client,
+            "get",
+            new=AsyncMock(return_value=jwks_response(jwks)),
+        ):
+            await dependencies.validate_jwt_token(token)
+
+        ((_, cached_until),) = dependencies._token_cache.values()
+        assert cached_until <= time.time() + 60 - dependencies.TOKEN_CACHE_EXP_MARGIN
+
+    async def test_least_recently_used_entry_evicted(self, rsa_keypair):
+        private_pem, jwks = rsa_keypair
+        tokens = [make_token(private_pem, sub=f"auth0|user-{i}") for i in range(3)]
+        with (
+            patch.object(dependencies, "TOKEN_CACHE_MAX_SIZE", 2),
+            patch.object(
+                dependencies._jwks_http_client,
+                "get",
+                new=AsyncMock(return_value=jwks_response(jwks)),
+            ),
+        ):
+            await dependencies.validate_jwt_token(tokens[0])
+            await dependencies.validate_jwt_token(tokens[1])
+            await dependencies.validate_jwt_token(tokens[0])  # refresh recency
+            await dependencies.validate_jwt_token(tokens[2])
+
+        cached_keys = set(dependencies._token_cache)
+        assert dependencies._token_cache_key(tokens[0]) in cached_keys
+        assert dependencies._token_cache_key(tokens[1]) not in cached_keys
+        assert dependencies._token_cache_key(tokens[2]) in cached_keys
+
+    async def test_invalid_token_not_cached(self, rsa_keypair):
+        private_pem, jwks = rsa_keypair
+        token = make_token(private_pem)[:-4] + "AAAA"
+        with patch.object(
+            dependencies._jwks_http_client,
+            "get",
+            new=AsyncMock(return_value=jwks_response(jwks)),
+        ):
+            with pytest.raises(HTTPException):
+                await dependencies.validate_jwt_token(token)
+
+        assert not dependencies._token_cache
+
+
+class TestAuthDependencies:
+    """Test FastAPI auth dependency functions."""
+
+    def test_auth_dependencies_are_coroutines(self):
+        """Auth dependencies must be async so FastAPI skips the threadpool."""
+        for dependency in (
+            dependencies.get_current_user,
+            dependencies.get_current_user_dict,
+            dependencies.get_current_user_optional,
+            dependencies.get_admin_user,
+            dependencies.get_alerts_write_user,
+        ):
+            assert asyncio.iscoroutinefunction(dependency), dependency.__name__
+
+    async def test_current_user_falls_back_when_plone_unavailable(self, rsa_keypair):
+        private_pem, jwks = rsa_keypair
+        request = MagicMock()
+        request.cookies = {"access_token": make_token(private_pem)}
+        with (
+            patch.object(
+                dependencies._jwks_http_client,
+                "get",
+                new=AsyncMock(return_value=jwks_response(jwks)),
+            ),
+            patch.object(
+                dependencies,
+                "sync_auth0_user_to_plone",
+                new=AsyncMock(side_effect=RuntimeError("Plone down")),
+            ),
+        ):
+            user = await dependencies.get_current_user(request, None)
+
+        assert user.sub == "auth0|test-user"
+        assert user.roles == ["Member"]
+        assert user.plone_groups == []
+        assert user.roles_lower == frozenset({"member"})
+
+    async def test_fallback_user_normalizes_list_audience(self, rsa_keypair):
+        private_pem, jwks = rsa_keypair
+        request = MagicMock()
+        request.cookies = {
+            "access_token": make_token(
+                private_pem, aud=["https://api.example.com", "client"]
+            )
+        }
+        with (
+            patch.object(
+                dependencies._jwks_http_client,
+                "get",
+                new=AsyncMock(return_value=jwks_response(jwks)),
+            ),
+            patch.object(
+                dependencies,
+                "sync_auth0_user_to_plone",
+                new=AsyncMock(return_value=None),
+            ),
+        ):
+            user = await dependencies.get_current_user(request, None)
+
+        assert user.aud == "https://api.example.com"
+        assert user.email == "dev@example.com"
+
+    @pytest.mark.parametrize("email", [None, "not-an-email"])
+    async def test_fallback_user_rejects_missing_email(self, rsa_keypair, email):
+        private_pem, jwks = rsa_keypair
+        request = MagicMock()
+        request.cookies = {"access_token": make_token(private_pem, email=email)}
+        with (
+            patch.object(
+                dependencies._jwks_http_client,
+                "get",
+                new=AsyncMock(return_value=jwks_response(jwks)),
+            ),
+            patch.object(
+                dependencies,
+                "sync_auth0_user_to_plone",
+                new=AsyncMock(return_value=None),
+            ),
+        ):
+            with pytest.raises(HTTPException) as exc_info:
+                await dependencies.get_current_user(request, None)
+
+        assert exc_info.value.status_code == 401
+
+    async def test_optional_user_without_credentials(self):
+        request = MagicMock()
+        assert await dependencies.get_current_user_optional(request, None) is None
+
+
+def make_user(**overrides) -> User:
+    fields = {
+        "sub": "auth0|test-user",
+        "email": "user@example.com",
+        "aud": "client",
+        "iss": "issuer",
+        "exp": 0,
+        "iat": 0,
+    }
+    fields.update(overrides)
+    return User(**fields)
+
+
+class TestAuthorizationDependencies:
+    """Test role and permission checks on the User model."""
+
+    def test_lowercased_role_sets(self):
+        user = make_user(roles=["Manager", "Faculty"], permissions=["Alerts:Write"])
+        assert user.roles_lower == frozenset({"manager", "faculty"})
+        assert user.permissions_lower == frozenset({"alerts:write"})
+        assert "roles_lower" not in user.model_dump()
+
+    async def test_admin_user_by_role(self):
+        user = make_user(roles=["Administrator"])
+        assert await dependencies.get_admin_user(user) is user
+
+    async def test_admin_user_by_email(self):
+        user = make_user(email="Site.Admin@Example.edu")
+        assert user.email_lower == "site.admin@example.edu"
+        assert await dependencies.get_admin_user(user) is user
+
+    async def test_admin_user_rejects_member(self):
+        with pytest.raises(HTTPException) as exc_info:
+            await dependencies.get_admin_user(make_user(roles=["Member"]))
+        assert exc_info.value.status_code == 403
+
+    async def test_alerts_write_user_by_permission(self):
+        user = make_user(permissions=["ALERTS:WRITE"])
+        assert await dependencies.get_alerts_write_user(user) is user
+
+    async def test_alerts_write_user_rejects_viewer(self):
+        with pytest.raises(HTTPException) as exc_info:
+            await dependencies.get_alerts_write_user(
+                make_user(roles=["Member"], permissions=["view"])
+            )
+        assert exc_info.value.status_code == 403
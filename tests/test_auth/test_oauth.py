@@ -0,0 +1,315 @@
+"""
+Tests for helpers in the Auth0 OAuth2 router.
+"""
+
+import time
+from unittest.mock import AsyncMock, patch
+from urllib.parse import parse_qs, urlsplit
+
+import httpx
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from jose import jwt
+
+from src.eduhub.auth import oauth
+from src.eduhub.auth.rate_limiting import rate_limiter
+
+
+class TestPeekClaims:
+    def test_matches_jose_unverified_claims(self):
+        claims = {"sub": "auth0|abc", "email": "dev@example.com", "exp": 2, "iat": 1}
+        token = jwt.encode(claims, "secret", algorithm="HS256")
+
+        assert oauth._peek_claims(token) == jwt.get_unverified_claims(token)
+
+    @pytest.mark.parametrize(
+        "token", ["not-a-jwt", "a.!!!.c", "eyJhbGciOiJIUzI1NiJ9.WzFd.sig"]
+    )
+    def test_malformed_token_raises(self, token):
+        with pytest.raises(ValueError):
+            oauth._peek_claims(token)
+
+
+@pytest.fixture
+def closed_breaker():
+    """Reset the Auth0 circuit breaker around each test."""
+    oauth._auth0_breaker.update(
+        failures=0, opened_at=0.0, cooldown=oauth.AUTH0_BREAKER_COOLDOWN
+    )
+    yield oauth._auth0_breaker
+    oauth._auth0_breaker.update(
+        failures=0, opened_at=0.0, cooldown=oauth.AUTH0_BREAKER_COOLDOWN
+    )
+
+
+def auth0_response(status_code, json_body=None, headers=None):
+    return httpx.Response(
+        status_code,
+        json=json_body or {},
+        headers=headers,
+        request=httpx.Request("POST", "https://auth0.test/oauth/token"),
+    )
+
+
+class TestAuth0CircuitBreaker:
+    async def test_successful_exchange_returns_tokens(self, closed_breaker):
+        post = AsyncMock(return_value=auth0_response(200, {"id_token": "abc"}))
+        with patch.object(oauth._auth0_client, "post", new=post):
+            assert await oauth.exchange_code_for_tokens("code") == {"id_token": "abc"}
+
+        assert closed_breaker["failures"] == 0
+
+    async def test_opens_after_consecutive_failures(self, closed_breaker):
+        post = AsyncMock(return_value=auth0_response(502))
+        with patch.object(oauth._auth0_client, "post", new=post):
+            for _ in range(oauth.AUTH0_BREAKER_THRESHOLD):
+                with pytest.raises(HTTPException) as exc_info:
+                    await oauth.exchange_code_for_tokens("code")
+                assert exc_info.value.status_code == 400
+
+            with pytest.raises(HTTPException) as exc_info:
+                await oauth.exchange_code_for_tokens("code")
+
+        assert exc_info.value.status_code == 503
+        assert post.await_count == oauth.AUTH0_BREAKER_THRESHOLD
+
+    async def test_client_errors_do_not_trip(self, closed_breaker):
+        post = AsyncMock(return_value=auth0_response(403, {"error": "invalid_grant"}))
+        with patch.object(oauth._auth0_client, "post", new=post):
+            for _ in range(oauth.AUTH0_BREAKER_THRESHOLD + 1):
+                with pytest.raises(HTTPException):
+                    await oauth.exchange_code_for_tokens("code")
+
+        assert post.await_count == oauth.AUTH0_BREAKER_THRESHOLD + 1
+
+    async def test_retry_after_extends_cooldown(self, closed_breaker):
+        response = auth0_response(429, headers={"Retry-After": "120"})
+        with patch.object(
+            oauth._auth0_client, "post", new=AsyncMock(return_value=response)
+        ):
+            for _ in range(oauth.AUTH0_BREAKER_THRESHOLD):
+                with pytest.raises(HTTPException):
+                    await oauth.exchange_code_for_tokens("code")
+
+        assert closed_breaker["cooldown"] == 120
+
+    async def test_half_open_probe_closes_breaker(self, closed_breaker):
+        closed_breaker.update(
+            failures=oauth.AUTH0_BREAKER_THRESHOLD,
+            opened_at=time.monotonic() - oauth.AUTH0_BREAKER_COOLDOWN - 1,
+        )
+        post = AsyncMock(return_value=auth0_response(200, {"id_token": "abc"}))
+        with patch.object(oauth._auth0_client, "post", new=post):
+            await oauth.exchange_code_for_tokens("code")
+
+        assert closed_breaker["failures"] == 0
+
+
+class TestAuditLogging:
+    def test_events_written_by_background_listener(self, capsys):
+        oauth.start_audit_logging()
+        try:
+            assert oauth._audit_logger.propagate is False
+            oauth.log_auth_event("login_success", {"user_id": "auth0|abc"})
+        finally:
+            oauth.stop_audit_logging()
+
+        assert oauth._audit_logger.propagate is True
+        assert '"event_type": "login_success"' in capsys.readouterr().err
+
+
+class TestAuth0Client:
+    async def test_client_reopened_after_shutdown(self):
+        await oauth.close_auth0_client()
+
+        client = oauth._get_auth0_client()
+
+        assert not client.is_closed
+        assert client is oauth._get_auth0_client()
+
+
+class TestLoginAndCallback:
+    @pytest.fixture
+    def client(self):
+        app = FastAPI()
+        app.include_router(oauth.router)
+        rate_limiter.requests.clear()  # login allows 5 requests a minute
+        yield TestClient(app, follow_redirects=False)
+        rate_limiter.requests.clear()
+
+    def complete_callback(self, client, state):
+        exchange = AsyncMock(return_value={"id_token": "id.token.value"})
+        validate = AsyncMock(return_value={"sub": "auth0|abc", "email": "a@b.c"})
+        with patch.object(oauth, "exchange_code_for_tokens", new=exchange):
+            with patch.object(oauth, "validate_jwt_token", new=validate):
+                return client.get(
+                    "/auth/callback", params={"code": "code", "state": state}
+                )
+
+    def test_login_sets_single_state_cookie(self, client):
+        response = client.get(
+            "/auth/login", params={"return_to": "http://localhost:8001/courses"}
+        )
+
+        assert response.status_code == 302
+        assert "auth_state" in response.cookies
+        assert "return_to" not in response.cookies
+
+    @pytest.mark.parametrize(
+        "params, expected",
+        [
+            ({}, {}),
+            ({"prompt": "none"}, {"prompt": ["none"]}),
+            (
+                {"login_hint": "dev+1@example.com"},
+                {"prompt": ["login"], "login_hint": ["dev+1@example.com"]},
+            ),
+        ],
+    )
+    def test_login_url_parameters(self, client, params, expected):
+        response = client.get("/auth/login", params=params)
+
+        query = parse_qs(urlsplit(response.headers["location"]).query)
+        assert query.pop("state") == [response.cookies["auth_state"]]
+        assert query.pop("response_type") == ["code"]
+        assert query.pop("scope") == ["openid profile email"]
+        query.pop("client_id")
+        query.pop("redirect_uri")
+        assert query == expected
+
+    def test_callback_redirects_to_return_to_from_state(self, client):
+        state = oauth._build_state("http://localhost:8001/courses")
+        client.cookies.set("auth_state", state)
+
+        response = self.complete_callback(client, state)
+
+        assert response.headers["location"] == (
+            "http://localhost:8001/courses#token=id.token.value"
+        )
+
+    def test_callback_rejects_mismatched_state(self, client):
+        client.cookies.set("auth_state", oauth._build_state(None))
+
+        response = self.complete_callback(
+            client, oauth._build_state("https://evil.example")
+        )
+
+        assert response.status_code == 400
+
+    def test_redirect_with_token_is_not_cacheable(self, client):
+        client.cookies.set("auth_state", "state-123")
+
+        response = self.complete_callback(client, "state-123")
+
+        assert response.status_code == 302
+        assert response.headers["location"].endswith("/#token=id.token.value")
+        assert response.headers["cache-control"] == "no-store"
+
+
+class TestStatusEndpoints:
+    @pytest.fixture
+    def client(self):
+        app = FastAPI()
+        app.include_router(oauth.router)
+        oauth._bad_token_cache.clear()
+        yield TestClient(app)
+        oauth._bad_token_cache.clear()
+
+    def test_status_without_token(self, client):
+        response = client.get("/auth/status")
+
+        assert response.status_code == 200
+        assert response.json() == {"authenticated": False, "user": None}
+
+    def test_status_with_invalid_token(self, client):
+        with patch.object(
+            oauth,
+            "validate_jwt_token",
+            new=AsyncMock(side_effect=HTTPException(status_code=401)),
+        ):
+            response = client.get(
+                "/auth/status", headers={"Authorization": "Bearer bad.token.here"}
+            )
+
+        assert response.json() == {"authenticated": False, "user": None}
+
+    def test_rejected_token_not_reverified(self, client):
+        validate = AsyncMock(side_effect=HTTPException(status_code=401))
+        with patch.object(oauth, "validate_jwt_token", new=validate):
+            for _ in range(3):
+                response = client.get(
+                    "/auth/status", headers={"Authorization": "Bearer bad.token.here"}
+                )
+                assert response.json()["authenticated"] is False
+
+        assert validate.await_count == 1
+
+    def test_unavailable_keys_not_negative_cached(self, client):
+        validate = AsyncMock(side_effect=HTTPException(status_code=500))
+        with patch.object(oauth, "validate_jwt_token", new=validate):
+            for _ in range(2):
+                client.get(
+                    "/auth/status", headers={"Authorization": "Bearer some.token.here"}
+                )
+
+        assert validate.await_count == 2
+
+    def test_status_with_valid_token(self, client):
+        claims = {"sub": "auth0|abc", "email": "dev@example.com", "name": "Dev"}
+        with patch.object(
+            oauth, "validate_jwt_token", new=AsyncMock(return_value=claims)
+        ):
+            response = client.get(
+                "/auth/status", headers={"Authorization": "Bearer good.token.here"}
+            )
+
+        body = response.json()
+        assert body["authenticated"] is True
+        assert body["user"]["role"] == "developer"
+
+    def test_token_status_uses_verified_payload(self, client):
+        now = int(time.time())
+        claims = {"sub": "auth0|abc", "email": "a@b.c", "exp": now + 3600, "iat": now}
+        with (
+            patch.object(
+                oauth, "validate_jwt_token", new=AsyncMock(return_value=claims)
+            ),
+            patch.object(oauth, "_peek_claims") as peek,
+        ):
+            response = client.get(
+                "/auth/token-status", headers={"Authorization": "Bearer a.b.c"}
+            )
+
+        body = response.json()
+        assert body["status"] == "valid"
+        assert body["user_sub"] == "auth0|abc"
+        peek.assert_not_called()
+
+    @pytest.mark.parametrize(
+        "token, expected_status",
+        [
+            (jwt.encode({"exp": 1, "iat": 0}, "secret"), "invalid"),
+            ("not-a-jwt", "malformed"),
+        ],
+    )
+    def test_token_status_for_rejected_token(self, client, token, expected_status):
+        with patch.object(
+            oauth,
+            "validate_jwt_token",
+            new=AsyncMock(side_effect=HTTPException(status_code=401)),
+        ):
+            response = client.get(
+                "/auth/token-status", headers={"Authorization": f"Bearer {token}"}
+            )
+
+        assert response.json()["status"] == expected_status
+
+    def test_token_status_without_token(self, client):
+        response = client.get("/auth/token-status")
+
+        assert response.json() == {
+            "has_token": False,
+            "status": "no_token",
+            "message": "No authentication token found",
+        }
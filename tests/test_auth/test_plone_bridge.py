@@ -0,0 +1,166 @@
+"""
+Tests for the Auth0 to Plone user bridge.
+
+The Plone client is replaced with an AsyncMock, so no Plone instance is
+required.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.eduhub.auth import plone_bridge
+
+AUTH0_USER = {
+    "sub": "auth0|abc123",
+    "email": "student@example.com",
+    "name": "Test Student",
+}
+PLONE_USER = {"username": "student_abc123", "email": "student@example.com"}
+
+
+@pytest.fixture(autouse=True)
+def clear_plone_user_cache():
+    plone_bridge._plone_user_cache.clear()
+    yield
+    plone_bridge._plone_user_cache.clear()
+
+
+def make_plone_client(existing_user=None, created_user=None):
+    client = MagicMock()
+    client.get_user_by_email = AsyncMock(return_value=existing_user)
+    client.create_user = AsyncMock(return_value=created_user)
+    return client
+
+
+class TestGetOrCreatePloneUser:
+    async def test_existing_user_cached_by_sub(self):
+        client = make_plone_client(existing_user=PLONE_USER)
+        with patch.object(
+            plone_bridge, "get_plone_client", new=AsyncMock(return_value=client)
+        ):
+            first = await plone_bridge.get_or_create_plone_user(AUTH0_USER)
+            second = await plone_bridge.get_or_create_plone_user(AUTH0_USER)
+
+        assert first == second == PLONE_USER
+        assert client.get_user_by_email.await_count == 1
+
+    async def test_cache_entry_expires(self):
+        client = make_plone_client(existing_user=PLONE_USER)
+        with patch.object(
+            plone_bridge, "get_plone_client", new=AsyncMock(return_value=client)
+        ):
+            await plone_bridge.get_or_create_plone_user(AUTH0_USER)
+            user, expires_at = plone_bridge._plone_user_cache[AUTH0_USER["sub"]]
+            plone_bridge._plone_user_cache[AUTH0_USER["sub"]] = (
+                user,
+                expires_at - plone_bridge.PLONE_USER_CACHE_TTL - 1,
+            )
+            await plone_bridge.get_or_create_plone_user(AUTH0_USER)
+
+        assert client.get_user_by_email.await_count == 2
+
+    async def test_created_user_cached(self):
+        client = make_plone_client(created_user=PLONE_USER)
+        with patch.object(
+            plone_bridge, "get_plone_client", new=AsyncMock(return_value=client)
+        ):
+            await plone_bridge.get_or_create_plone_user(AUTH0_USER)
+            await plone_bridge.get_or_create_plone_user(AUTH0_USER)
+
+        assert client.create_user.await_count == 1
+        assert client.get_user_by_email.await_count == 1
+
+    async def test_new_user_created_with_roles(self):
+        client = make_plone_client(created_user=PLONE_USER)
+        auth0_user = dict(AUTH0_USER, email="prof@example.edu")
+        with patch.object(
+            plone_bridge, "get_plone_client", new=AsyncMock(return_value=client)
+        ):
+            await plone_bridge.get_or_create_plone_user(auth0_user)
+
+        client.create_user.assert_awaited_once()
+        assert client.create_user.await_args.kwargs["roles"] == ["Faculty"]
+
+    async def test_failures_not_cached(self):
+        client = make_plone_client()
+        client.get_user_by_email.side_effect = plone_bridge.PloneAPIError("down")
+        with patch.object(
+            plone_bridge, "get_plone_client", new=AsyncMock(return_value=client)
+        ):
+            assert await plone_bridge.get_or_create_plone_user(AUTH0_USER) is None
+            assert await plone_bridge.get_or_create_plone_user(AUTH0_USER) is None
+
+        assert client.get_user_by_email.await_count == 2
+
+    async def test_concurrent_first_logins_create_user_once(self):
+        client = make_plone_client()
+
+        async def slow_create(**kwargs):
+            await asyncio.sleep(0.01)
+            return PLONE_USER
+
+        client.create_user.side_effect = slow_create
+        with patch.object(
+            plone_bridge, "get_plone_client", new=AsyncMock(return_value=client)
+        ):
+            users = await asyncio.gather(
+                *(plone_bridge.get_or_create_plone_user(AUTH0_USER) for _ in range(5))
+            )
+
+        assert users == [PLONE_USER] * 5
+        assert client.create_user.await_count == 1
+        assert plone_bridge._plone_user_inflight == {}
+
+
+class TestCombineUserContext:
+    @pytest.mark.parametrize(
+        "plone_roles, expected_permissions",
+        [
+            (["Manager"], ["view", "create", "edit", "delete", "admin"]),
+            (["Faculty", "Student"], ["view", "create", "edit"]),
+            ([], ["view"]),
+        ],
+    )
+    def test_permissions_follow_most_privileged_role(
+        self, plone_roles, expected_permissions
+    ):
+        user = plone_bridge.combine_user_context(
+            AUTH0_USER, {"username": "student_abc123", "roles": plone_roles}
+        )
+
+        assert user.permissions == expected_permissions
+
+    def test_roles_deduplicated_in_order(self):
+        user = plone_bridge.combine_user_context(
+            AUTH0_USER, {"username": "u", "roles": ["Member", "Editor", "Member"]}
+        )
+
+        assert user.roles == ["Member", "Editor"]
+
+
+class TestExtractRolesFromAuth0:
+    @pytest.mark.parametrize(
+        "email, expected_roles",
+        [
+            ("prof@example.edu", ["Faculty"]),
+            ("kid@student.example.edu", ["Student"]),
+            ("admin@example.edu", ["Faculty", "Manager"]),
+            ("admin@example.com", ["Manager"]),
+            ("someone@elsewhere.org", ["Member"]),
+            ("", ["Member"]),
+        ],
+    )
+    def test_roles_from_email(self, email, expected_roles):
+        assert plone_bridge.extract_roles_from_auth0({"email": email}) == (
+            expected_roles
+        )
+
+    def test_claimed_roles_kept_first(self):
+        auth0_user = {"email": "prof@example.edu", "roles": ["Editor", "Faculty"]}
+
+        assert plone_bridge.extract_roles_from_auth0(auth0_user) == [
+            "Editor",
+            "Faculty",
+        ]
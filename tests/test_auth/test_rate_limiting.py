@@ -0,0 +1,306 @@
+"""
+Tests for the in-memory auth rate limiter.
+"""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi import Depends, FastAPI, HTTPException, Request
+from fastapi.testclient import TestClient
+
+from src.eduhub.auth import rate_limiting
+from src.eduhub.auth.rate_limiting import (
+    RateLimit,
+    RateLimiter,
+    RedisRateLimiter,
+    get_client_ip,
+    rate_limit,
+    rate_limiter,
+)
+
+NS = 1_000_000_000
+
+
+@pytest.fixture
+def clock():
+    """Freeze the rate limiter clock at a settable time, in seconds."""
+    now = [1_000_020]
+    with patch.object(
+        rate_limiting.time, "monotonic_ns", side_effect=lambda: now[0] * NS
+    ):
+        yield now
+
+
+class TestFixedWindow:
+    def test_blocks_after_max_requests(self, clock):
+        limiter = RateLimiter()
+
+        assert [limiter.is_allowed("1.2.3.4", 3, 60) for _ in range(4)] == [
+            True,
+            True,
+            True,
+            False,
+        ]
+        assert limiter.requests["1.2.3.4"] == [1_000_020 * NS, 3, 0]
+
+    def test_counter_resets_in_next_window(self, clock):
+        limiter = RateLimiter()
+        for _ in range(3):
+            limiter.is_allowed("1.2.3.4", 3, 60)
+
+        clock[0] += 60
+
+        assert limiter.is_allowed("1.2.3.4", 3, 60)
+        assert limiter.requests["1.2.3.4"] == [1_000_080 * NS, 1, 3]
+
+    def test_reset_time_is_end_of_window(self, clock):
+        limiter = RateLimiter()
+        limiter.is_allowed("1.2.3.4", 3, 60)
+
+        assert limiter.get_reset_time("1.2.3.4", 60) == 1_000_080 * NS
+        assert limiter.get_reset_time("5.6.7.8", 60) == clock[0] * NS
+
+    def test_request_count_covers_current_window_only(self, clock):
+        limiter = RateLimiter()
+        for _ in range(2):
+            limiter.is_allowed("1.2.3.4", 3, 60)
+
+        assert limiter.get_request_count("1.2.3.4", 60) == 2
+        assert limiter.get_request_count("5.6.7.8", 60) == 0
+
+        clock[0] += 60
+
+        assert limiter.get_request_count("1.2.3.4", 60) == 0
+
+    def test_least_recently_seen_ip_evicted_at_capacity(self, clock):
+        limiter = RateLimiter(max_ips=2)
+        limiter.is_allowed("1.1.1.1", 3, 60)
+        limiter.is_allowed("2.2.2.2", 3, 60)
+        limiter.is_allowed("1.1.1.1", 3, 60)
+
+        limiter.is_allowed("3.3.3.3", 3, 60)
+
+        assert list(limiter.requests) == ["1.1.1.1", "3.3.3.3"]
+
+    async def test_check_returns_reset_time_when_denied(self, clock):
+        limiter = RateLimiter()
+
+        assert await limiter.check("1.2.3.4", 1, 60) == (True, 0)
+        assert await limiter.check("1.2.3.4", 1, 60) == (False, 1_000_080 * NS)
+
+    def test_cleanup_removes_idle_ips(self, clock):
+        limiter = RateLimiter()
+        limiter.is_allowed("1.2.3.4", 3, 60)
+        clock[0] += 3660
+        limiter.is_allowed("5.6.7.8", 3, 60)
+
+        limiter.cleanup_old_entries(max_age_seconds=3600)
+
+        assert list(limiter.requests) == ["5.6.7.8"]
+
+
+class TestPreciseWindow:
+    def test_previous_window_weighted_by_overlap(self, clock):
+        limiter = RateLimiter()
+        for _ in range(4):
+            limiter.is_allowed("1.2.3.4", 4, 60, precise=True)
+
+        # 15s into the next window, three of the previous four still count
+        clock[0] += 75
+        assert [
+            limiter.is_allowed("1.2.3.4", 4, 60, precise=True) for _ in range(2)
+        ] == [True, False]
+
+        # 45s in, only one of the previous four still counts
+        clock[0] += 30
+        assert [
+            limiter.is_allowed("1.2.3.4", 4, 60, precise=True) for _ in range(3)
+        ] == [True, True, False]
+
+    def test_counts_dropped_after_idle_window(self, clock):
+        limiter = RateLimiter()
+        for _ in range(4):
+            limiter.is_allowed("1.2.3.4", 4, 60, precise=True)
+
+        clock[0] += 125
+
+        assert limiter.is_allowed("1.2.3.4", 4, 60, precise=True)
+        assert limiter.requests["1.2.3.4"] == [1_000_140 * NS, 1, 0]
+
+
+class TestRedisRateLimiter:
+    @pytest.fixture
+    def wall_clock(self):
+        with patch.object(rate_limiting.time, "time_ns", return_value=1_000_065 * NS):
+            yield
+
+    async def test_script_gets_window_keys_and_limits(self, wall_clock):
+        limiter = RedisRateLimiter()
+        script = AsyncMock(return_value=1)
+        with patch.object(limiter, "_get_script", return_value=script):
+            assert await limiter.check("1.2.3.4", 5, 60, precise=True) == (True, 0)
+
+        script.assert_awaited_once_with(
+            keys=["rl:{1.2.3.4}:16667", "rl:{1.2.3.4}:16666"],
+            args=[60_000, 15_000, 5],
+        )
+
+    async def test_fixed_window_ignores_previous_window(self, clock, wall_clock):
+        limiter = RedisRateLimiter()
+        script = AsyncMock(return_value=0)
+        with patch.object(limiter, "_get_script", return_value=script):
+            assert await limiter.check("1.2.3.4", 5, 60) == (False, 1_000_035 * NS)
+
+        assert script.await_args.kwargs["args"] == [60_000, 0, 5]
+
+    async def test_denied_limit_answered_locally_until_reset(self, clock, wall_clock):
+        limiter = RedisRateLimiter()
+        script = AsyncMock(return_value=0)
+        with patch.object(limiter, "_get_script", return_value=script):
+            assert await limiter.check("1.2.3.4", 5, 60) == (False, 1_000_035 * NS)
+            assert await limiter.check("1.2.3.4", 5, 60) == (False, 1_000_035 * NS)
+            assert script.await_count == 1
+
+            # Other limits for the same IP still go to Redis
+            script.return_value = 1
+            assert await limiter.check("1.2.3.4", 10, 60) == (True, 0)
+
+            clock[0] += 15
+            assert await limiter.check("1.2.3.4", 5, 60) == (True, 0)
+
+        assert script.await_count == 3
+
+    async def test_falls_back_to_memory_when_redis_fails(self, clock):
+        limiter = RedisRateLimiter()
+        script = AsyncMock(side_effect=ConnectionError("redis down"))
+        with patch.object(limiter, "_get_script", return_value=script):
+            results = [await limiter.check("1.2.3.4", 2, 60) for _ in range(3)]
+
+        assert results == [(True, 0), (True, 0), (False, 1_000_080 * NS)]
+
+    async def test_skips_redis_during_cooldown_after_failure(self, clock):
+        limiter = RedisRateLimiter()
+        script = AsyncMock(side_effect=ConnectionError("redis down"))
+        with patch.object(limiter, "_get_script", return_value=script):
+            await limiter.check("1.2.3.4", 5, 60)
+            await limiter.check("1.2.3.4", 5, 60)
+            assert script.await_count == 1
+
+            clock[0] += int(rate_limiting.RATE_LIMIT_REDIS_COOLDOWN)
+            await limiter.check("1.2.3.4", 5, 60)
+
+        assert script.await_count == 2
+
+    def test_reset_time_is_end_of_wall_clock_window(self, clock, wall_clock):
+        limiter = RedisRateLimiter()
+
+        assert limiter.get_reset_time("1.2.3.4", 60) == (clock[0] + 15) * NS
+
+
+class TestRateLimitDecorator:
+    @pytest.fixture(autouse=True)
+    def clear_rate_limiter(self):
+        rate_limiter.requests.clear()
+        yield
+        rate_limiter.requests.clear()
+
+    @pytest.fixture
+    def client(self):
+        app = FastAPI()
+
+        @app.get("/limited")
+        @rate_limit(max_requests=2, window_seconds=60)
+        async def limited(request: Request):
+            return {"ok": True}
+
+        return TestClient(app)
+
+    def test_denied_request_gets_retry_after(self, client, clock):
+        assert client.get("/limited").status_code == 200
+        assert client.get("/limited").status_code == 200
+        clock[0] += 45
+
+        response = client.get("/limited")
+
+        assert response.status_code == 429
+        assert response.headers["retry-after"] == "15"
+        assert response.json() == {
+            "detail": "Rate limit exceeded. Try again in 15 seconds."
+        }
+
+    async def test_request_found_in_positional_args(self, clock):
+        @rate_limit(max_requests=1, window_seconds=60)
+        async def endpoint(request: Request):
+            return "ok"
+
+        request = Request({"type": "http", "headers": [], "client": ("10.0.0.9", 1)})
+
+        assert await endpoint(request) == "ok"
+        with pytest.raises(HTTPException) as exc_info:
+            await endpoint(request)
+        assert exc_info.value.status_code == 429
+
+    def test_endpoint_without_request_left_unwrapped(self):
+        async def endpoint(name: str):
+            return name
+
+        assert rate_limit()(endpoint) is endpoint
+
+
+class TestRateLimitDependency:
+    @pytest.fixture
+    def client(self):
+        app = FastAPI()
+        calls = []
+
+        def authenticate():
+            calls.append("auth")
+
+        @app.get(
+            "/limited",
+            dependencies=[Depends(RateLimit(max_requests=1, window_seconds=60))],
+        )
+        async def limited(_=Depends(authenticate)):
+            return {"ok": True}
+
+        rate_limiter.requests.clear()
+        yield TestClient(app), calls
+        rate_limiter.requests.clear()
+
+    def test_rejects_before_other_dependencies(self, client, clock):
+        client, calls = client
+
+        assert client.get("/limited").status_code == 200
+        response = client.get("/limited")
+
+        assert response.status_code == 429
+        assert response.headers["retry-after"] == "60"
+        assert calls == ["auth"]
+
+
+class TestGetClientIp:
+    def make_request(self, headers):
+        return Request(
+            {
+                "type": "http",
+                "headers": [(k.lower().encode(), v.encode()) for k, v in headers],
+                "client": ("10.0.0.9", 5000),
+            }
+        )
+
+    @pytest.mark.parametrize(
+        "headers, expected",
+        [
+            ([("X-Forwarded-For", " 203.0.113.7 , 10.0.0.1, 10.0.0.2")], "203.0.113.7"),
+            ([("X-Forwarded-For", "2001:db8::1")], "2001:db8::1"),
+            ([("X-Real-IP", " 198.51.100.4 ")], "198.51.100.4"),
+            (
+                [("X-Real-IP", "198.51.100.4"), ("X-Forwarded-For", "203.0.113.7")],
+                "203.0.113.7",
+            ),
+            ([("X-Forwarded-For", ""), ("X-Real-IP", "198.51.100.4")], "198.51.100.4"),
+            ([], "10.0.0.9"),
+        ],
+    )
+    def test_client_ip_from_headers(self, headers, expected):
+        assert get_client_ip(self.make_request(headers)) == expected
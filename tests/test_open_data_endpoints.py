@@ -456,6 +456,34 @@ class TestRateLimiting:
 
         # Check retry-after header
         assert "Retry-After" in response.headers
+        retry_after = int(response.headers["Retry-After"])
+        assert 1 <= retry_after <= 60
+        assert response.json()["detail"]["details"]["retry_after"] == retry_after
+
+    def test_rate_limit_info_reports_current_window_usage(self):
+        """Test that rate limit info counts requests in the current window."""
+        from starlette.requests import Request
+
+        from src.eduhub.open_data.rate_limit import (
+            OPEN_DATA_RATE_LIMIT,
+            RATE_LIMIT_WINDOW,
+            get_rate_limit_info,
+            get_rate_limiter,
+        )
+
+        request = Request(
+            {"type": "http", "headers": [], "client": ("203.0.113.9", 1234)}
+        )
+        for _ in range(2):
+            get_rate_limiter().is_allowed(
+                "203.0.113.9", OPEN_DATA_RATE_LIMIT, RATE_LIMIT_WINDOW
+            )
+
+        info = get_rate_limit_info(request)
+
+        assert info["current_count"] == 2
+        assert info["remaining"] == OPEN_DATA_RATE_LIMIT - 2
+        assert info["client_ip"] == "203.0.113.9"
 
 
 class TestCaching:
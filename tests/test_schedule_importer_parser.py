@@ -0,0 +1,50 @@
+"""
+Tests for schedule file parsing in the CSV importer.
+"""
+
+import io
+import os
+import sys
+
+import pytest
+from fastapi import HTTPException, UploadFile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.eduhub.schedule_importer.parser import ScheduleParser
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def make_upload(content: bytes, filename: str = "schedule.csv", size=None):
+    return UploadFile(file=io.BytesIO(content), filename=filename, size=size)
+
+
+class TestParseFile:
+    async def test_parses_file_copied_in_chunks(self, monkeypatch):
+        monkeypatch.setattr(ScheduleParser, "UPLOAD_CHUNK_SIZE", 16)
+        with open(os.path.join(FIXTURES, "sample_schedule_valid.csv"), "rb") as f:
+            content = f.read()
+
+        rows, errors = await ScheduleParser().parse_file(make_upload(content))
+
+        assert errors == []
+        assert rows[0].program == "Python 101"
+        assert len(rows) == content.count(b"\n") - 1
+
+    async def test_rejects_declared_oversize_file(self):
+        upload = make_upload(b"", size=ScheduleParser.MAX_FILE_SIZE + 1)
+
+        with pytest.raises(HTTPException) as exc_info:
+            await ScheduleParser().parse_file(upload)
+
+        assert exc_info.value.status_code == 413
+
+    async def test_rejects_oversize_file_without_declared_size(self, monkeypatch):
+        monkeypatch.setattr(ScheduleParser, "MAX_FILE_SIZE", 64)
+        content = b"program,date,time,instructor,room\n" + b"x" * 64
+
+        with pytest.raises(HTTPException) as exc_info:
+            await ScheduleParser().parse_file(make_upload(content))
+
+        assert exc_info.value.status_code == 413